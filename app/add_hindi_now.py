@@ -12,9 +12,11 @@ async def add_hindi():
     
     for art in articles:
         art.pop("_id")
+        # url is unique - give the clone its own, and re-runs just find it again
+        art["url"] = f"{art['url']}#hi"
         art["language"] = "hi"
         art["category"] = art.get("category", "general")
-        await db.news.insert_one(art)
+        await db.news.update_one({"url": art["url"]}, {"$setOnInsert": art}, upsert=True)
     
     print("✅ Added 20 Hindi articles!")
     client.close()
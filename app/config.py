@@ -9,6 +9,86 @@ class Settings(BaseSettings):
     # News API
     news_api_key: str
     
+    # Ingestion (concurrent fetch paced by a token bucket)
+    fetch_concurrency: int = 4
+    newsapi_rate_per_second: float = 1.0
+    newsapi_burst: int = 2
+    
+    # Ingest pipeline stages (fetch workers = fetch_concurrency)
+    pipeline_queue_size: int = 4
+    pipeline_normalize_workers: int = 1
+    pipeline_store_workers: int = 2
+    pipeline_hook_workers: int = 1
+    
+    # Background warm-up (failed steps retry with doubling backoff up to the max)
+    warmup_retry_seconds: float = 2.0
+    warmup_retry_max_seconds: float = 60.0
+    
+    # Scheduler leader election (one process per cluster runs background jobs)
+    leader_lease_seconds: int = 30
+    leader_heartbeat_seconds: int = 10
+    
+    # Adaptive per-feed refresh (intervals in minutes, quota in NewsAPI calls/day)
+    adaptive_tick_minutes: int = 15
+    adaptive_default_interval_minutes: int = 360
+    adaptive_min_interval_minutes: int = 60
+    adaptive_max_interval_minutes: int = 1440
+    adaptive_target_yield: float = 5.0
+    newsapi_daily_quota: int = 100
+    
+    # Near-duplicate detection ("drop" or "link" to the existing cluster)
+    near_duplicate_action: str = "drop"
+    near_duplicate_max_distance: int = 3
+    
+    # Outbound HTTP (shared pools, HTTP/2 when the h2 package is installed)
+    http2_enabled: bool = True
+    
+    # Retention (createdAt TTL index) and orphaned audio collection
+    article_retention_days: int = 7
+    audio_gc_batch_size: int = 500
+    audio_gc_min_age_minutes: int = 60
+    
+    # Feed total-count cache
+    count_cache_ttl_seconds: float = 60.0
+    
+    # Response cache for feed, trending and article endpoints
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+    response_cache_ttl_seconds: float = 300.0
+    
+    # Materialised first-N home feeds per language/category
+    home_feed_size: int = 100
+    home_feed_max_age_seconds: float = 300.0
+    home_feed_persist: bool = False
+    
+    # Popularity trending (views/summary requests decayed by age)
+    trending_window_hours: int = 48
+    trending_gravity: float = 1.5
+    trending_size: int = 100
+    trending_flush_seconds: int = 30
+    trending_recompute_seconds: int = 60
+    trending_sync_overlap_seconds: int = 120
+    trending_full_rescan_minutes: int = 30
+    
+    # Summary single-flight (cross-worker lease while one worker generates)
+    summary_lease_seconds: int = 120
+    summary_poll_seconds: float = 0.5
+    
+    # Summary job queue (workers per process, ingest pre-summarisation per feed batch)
+    summary_workers: int = 2
+    summary_job_max_attempts: int = 3
+    summary_job_poll_seconds: float = 5.0
+    summary_job_retention_hours: int = 24
+    summary_presummarize_per_batch: int = 2
+    
+    # Text-to-speech thread pool (gTTS blocks)
+    tts_workers: int = 2
+    tts_max_queue: int = 8
+    tts_timeout_seconds: float = 60.0
+    
+    # Publisher page extraction (download cap, text kept for summaries)
+    article_fetch_max_bytes: int = 1024 * 1024
+    article_text_max_chars: int = 5000
+    
     # AI API (optional - use one)
     huggingface_api_key: str = ""
     gemini_api_key: str = ""
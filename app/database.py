@@ -1,8 +1,11 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
 from app.config import settings
 
 class Database:
     client: AsyncIOMotorClient = None
+    # Index names that failed in the last create_indexes() run (None until it has run)
+    missing_indexes: list = None
     
 db = Database()
 
@@ -15,4 +18,92 @@ async def close_mongo_connection():
     print("Closed MongoDB connection")
 
 def get_database():
-    return db.client[settings.database_name]
\ No newline at end of file
+    return db.client[settings.database_name]
+
+# (collection, keys, options) - created at startup by create_indexes()
+INDEXES = [
+    # Bulk upserts in NewsFetcher are keyed on url
+    ("news", [("url", ASCENDING)], {"unique": True, "name": "url_unique"}),
+    # Feed listing: equality filters first, then the FEED_SORT keys for keyset pagination
+    ("news", [
+        ("language", ASCENDING), ("category", ASCENDING),
+        ("publishedAt", DESCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)
+    ], {"name": "feed_keyset"}),
+    # Same order without filters (all-language feed, trending)
+    ("news", [("publishedAt", DESCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)], {"name": "feed_sort"}),
+    # Full-text search. Hindi has no Mongo stemmer, so the default is "none" and
+    # English articles opt into stemming through their searchLanguage field.
+    ("news", [("title", "text"), ("description", "text"), ("content", "text")], {
+        "weights": {"title": 10, "description": 4, "content": 1},
+        "default_language": "none",
+        "language_override": "searchLanguage",
+        "name": "news_text"
+    }),
+    # Articles expire after the retention window - replaces the daily delete_many scan
+    ("news", [("createdAt", ASCENDING)], {
+        "expireAfterSeconds": settings.article_retention_days * 86400,
+        "name": "createdAt_ttl"
+    }),
+    # Audio GC looks up referenced files in batches
+    ("news", [("audioSummaryUrl", ASCENDING)], {"sparse": True, "name": "audioSummaryUrl"}),
+    # Trending recompute reads articles whose view counters moved since the last pass
+    ("news", [("popularityAt", ASCENDING)], {"sparse": True, "name": "popularityAt"}),
+    # Scheduler leader lease - Mongo removes leases nobody renewed
+    ("scheduler_leases", [("expiresAt", ASCENDING)], {"expireAfterSeconds": 0, "name": "lease_ttl"}),
+    # Per-article summary generation leases, same expiry
+    ("summary_leases", [("expiresAt", ASCENDING)], {"expireAfterSeconds": 0, "name": "lease_ttl"}),
+    # Summary job queue: workers claim by priority, one active job per article,
+    # finished jobs expire after the retention window
+    ("summary_jobs", [("active", ASCENDING), ("priority", DESCENDING), ("createdAt", ASCENDING)], {"name": "job_claim"}),
+    ("summary_jobs", [("articleId", ASCENDING)], {
+        "unique": True,
+        "partialFilterExpression": {"active": True},
+        "name": "one_active_job"
+    }),
+    ("summary_jobs", [("finishedAt", ASCENDING)], {
+        "expireAfterSeconds": settings.summary_job_retention_hours * 3600,
+        "name": "job_ttl"
+    }),
+]
+
+async def dedupe_urls() -> int:
+    """Keep only the oldest `news` doc per url (one-off, before url_unique is built).
+    
+    Databases from before the unique index can hold several docs with the same
+    url (e.g. clones made by add_hindi_now.py), which would fail the index build.
+    """
+    collection = get_database()["news"]
+    pipeline = [
+        {"$sort": {"createdAt": ASCENDING, "_id": ASCENDING}},
+        {"$group": {"_id": "$url", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    
+    removed = 0
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        result = await collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    
+    if removed:
+        print(f"🧹 Removed {removed} duplicate-url articles before building url_unique")
+    return removed
+
+async def create_indexes():
+    """Create the indexes the app relies on (idempotent)"""
+    database = get_database()
+    
+    # The unique url index can't be built over existing duplicates - clean them up first
+    if "url_unique" not in await database["news"].index_information():
+        await dedupe_urls()
+    
+    missing = []
+    for collection, keys, options in INDEXES:
+        try:
+            await database[collection].create_index(keys, **options)
+        except Exception as e:
+            # The app still works without it, just slower - /ready lists what is missing
+            missing.append(f"{collection}.{options.get('name')}")
+            print(f"⚠️ Index {options.get('name')} on {collection} failed: {e}")
+    db.missing_indexes = missing
+    
+    print(f"✅ MongoDB indexes ready ({len(INDEXES) - len(missing)}/{len(INDEXES)})")
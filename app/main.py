@@ -1,13 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from contextlib import asynccontextmanager
 from app.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
+from app.database import db as database, connect_to_mongo, close_mongo_connection, get_database
 from app.routes import news, notifications
-from app.utils.scheduler import start_scheduler, stop_scheduler
+from app.utils.scheduler import start_scheduler, stop_scheduler, scheduler_status
 from app.services.news_fetcher import news_fetcher
+from app.services.http_client import http_clients
+from app.services.dedup import near_duplicate_index
+from app.services.warmup import warm_up
+from app.services.feed_schedule import feed_schedule
+from app.services.count_cache import count_cache
+from app.services.response_cache import response_cache
+from app.services.home_feeds import home_feeds
+from app.services.trending import trending_service
+from app.services.summary_flight import summary_flight
+from app.services.summary_jobs import summary_jobs
+from app.services.tts_pool import tts_pool
+from app.utils.leader import leader_lease
+from app.utils.audio_files import AudioFiles
 from pathlib import Path
+import asyncio
 import os
 
 # # ✅ CRITICAL: Initialize Firebase FIRST, before anything else
@@ -56,18 +72,28 @@ except Exception as e:
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    await http_clients.start()
     start_scheduler()
+    summary_jobs.start()
     
     # Create static directory
     Path("static/audio").mkdir(parents=True, exist_ok=True)
     
-    print("Fetching initial news...")
-    await news_fetcher.fetch_and_store_all_categories()
+    # Indexes, dedup index and the first fetch run in the background - /ready reports progress
+    print("Fetching initial news in the background...")
+    warm_up.start()
     
     yield
     
     # Shutdown
+    await warm_up.stop()
+    await summary_jobs.stop()
+    tts_pool.close()
     stop_scheduler()
+    # Don't lose the last interval's view counts
+    await trending_service.flush()
+    await leader_lease.release()
+    await http_clients.close()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -104,7 +130,8 @@ app.add_middleware(
 )
 
 
-# Mount static files
+# Mount static files - audio first, with immutable caching and byte ranges
+app.mount("/static/audio", AudioFiles(directory="static/audio", check_dir=False), name="audio")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Include routers
@@ -122,4 +149,66 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness for the load balancer - 503 until Mongo is reachable and there is news to serve"""
+    mongo = {"ok": False}
+    has_articles = False
+    try:
+        db = get_database()
+        await asyncio.wait_for(db.command("ping"), timeout=2.0)
+        mongo["ok"] = True
+        # Existing data is enough to serve while the first fetch is still running
+        has_articles = await db["news"].estimated_document_count() > 0
+    except Exception as e:
+        mongo["error"] = str(e) or type(e).__name__
+    
+    warm = warm_up.status()
+    # A warm-up still retrying a failed step isn't ready on its own - only existing data makes it so
+    is_ready = mongo["ok"] and (has_articles or warm["state"] == "done")
+    
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content=jsonable_encoder({
+            "ready": is_ready,
+            "mongo": mongo,
+            "hasArticles": has_articles,
+            "warmUp": warm,
+            # url_unique missing means bulk upserts run without their uniqueness guarantee
+            "missingIndexes": database.missing_indexes,
+            "scheduler": scheduler_status()
+        })
+    )
+
+@app.get("/stats")
+async def stats(x_api_key: str = Header(None)):
+    """Runtime stats for sizing pools and caches
+    
+    ⚠️ PRODUCTION: Requires API key in header: X-API-Key
+    (it exposes pool internals and the leader's host:pid)
+    """
+    environment = os.getenv("ENVIRONMENT", "development")
+    
+    if environment == "production":
+        admin_api_key = os.getenv("ADMIN_API_KEY")
+        if not admin_api_key or x_api_key != admin_api_key:
+            raise HTTPException(
+                status_code=403,
+                detail="Forbidden: Valid API key required for stats in production"
+            )
+    
+    return {
+        "http": http_clients.stats(),
+        "ingest": news_fetcher.last_run_stats,
+        "dedup": near_duplicate_index.stats(),
+        "schedule": feed_schedule.stats(),
+        "count_cache": count_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "home_feeds": home_feeds.stats(),
+        "trending": trending_service.stats(),
+        "summaries": summary_flight.stats(),
+        "summary_jobs": summary_jobs.stats(),
+        "tts": tts_pool.stats()
+    }
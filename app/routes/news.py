@@ -1,32 +1,111 @@
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse, JSONResponse
 from app.database import get_database
 from app.models.news import NewsResponse
-from app.services.ai_summarizer import ai_summarizer
+from app.services.count_cache import count_cache
+from app.services.response_cache import CachedResponse, response_cache, cache_key, make_etag, render_json
+from app.services.home_feeds import home_feeds
+from app.services.trending import trending_service
+from app.services.summary_jobs import summary_jobs, stored_summary
 from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 from pathlib import Path
+from app.utils.pagination import FEED_SORT, after_cursor, encode_cursor
+from app.utils.text import text_search_terms
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
-def serialize_news(news_doc) -> dict:
-    """FIXED - Better serialization"""
-    return {
-        "id": str(news_doc["_id"]),
-        "title": news_doc.get("title", "No title"),
-        "description": news_doc.get("description", "No description available"),
-        "content": news_doc.get("content", news_doc.get("description", "")),
-        "url": news_doc.get("url", ""),
-        "urlToImage": news_doc.get("urlToImage"),
-        "publishedAt": news_doc.get("publishedAt", datetime.utcnow()),
-        "source": news_doc.get("source", {"name": "Unknown", "id": None}),
-        "language": news_doc.get("language", "en"),
-        "category": news_doc.get("category", "general"),
-        "aiSummary": news_doc.get("aiSummary"),
-        "audioSummaryUrl": news_doc.get("audioSummaryUrl"),
-        "createdAt": news_doc.get("createdAt", datetime.utcnow())
-    }
+# Data only changes on ingest, so clients/CDN may reuse responses briefly and
+# revalidate with If-None-Match (a 304 costs no database work)
+FEED_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+ARTICLE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=3600"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
+def json_response(cached, if_none_match: Optional[str], cache_control: str) -> Response:
+    """200 with the cached body, or 304 when the client already has it"""
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+# Public article fields in response order, each with its fallback for missing data
+ARTICLE_FIELDS = {
+    "title": lambda doc: doc.get("title", "No title"),
+    "description": lambda doc: doc.get("description", "No description available"),
+    "content": lambda doc: doc.get("content", doc.get("description", "")),
+    "url": lambda doc: doc.get("url", ""),
+    "urlToImage": lambda doc: doc.get("urlToImage"),
+    "publishedAt": lambda doc: doc["publishedAt"] if "publishedAt" in doc else datetime.utcnow(),
+    "source": lambda doc: doc.get("source", {"name": "Unknown", "id": None}),
+    "language": lambda doc: doc.get("language", "en"),
+    "category": lambda doc: doc.get("category", "general"),
+    "aiSummary": lambda doc: doc.get("aiSummary"),
+    "audioSummaryUrl": lambda doc: doc.get("audioSummaryUrl"),
+    "createdAt": lambda doc: doc["createdAt"] if "createdAt" in doc else datetime.utcnow(),
+}
+
+# Cards skip the heavy article body - use view=full or fields= to get it
+CARD_FIELDS = [name for name in ARTICLE_FIELDS if name != "content"]
+
+def serialize_news(news_doc, fields: Optional[List[str]] = None) -> dict:
+    """FIXED - Better serialization, optionally limited to `fields`"""
+    article = {"id": str(news_doc["_id"])}
+    for name, getter in ARTICLE_FIELDS.items():
+        if fields is None or name in fields:
+            article[name] = getter(news_doc)
+    return article
+
+# NewsResponse's fields, in its order - trending and single-article payloads use this shape
+NEWS_RESPONSE_FIELDS = list(NewsResponse.model_fields)
+
+def as_news_response(article: dict) -> dict:
+    """Shape a serialised article as NewsResponse validation would, without building the model.
+    
+    Keeps only the model's fields (so audioSummaryUrl is dropped, as before) and
+    normalises `source` to {id, name}.
+    """
+    shaped = {name: article.get(name) for name in NEWS_RESPONSE_FIELDS}
+    source = shaped["source"] or {}
+    shaped["source"] = {"id": source.get("id"), "name": source.get("name")}
+    return shaped
+
+def resolve_fields(view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """Fields a list endpoint returns: explicit `fields=`, else the view's set (None = all)"""
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip() and name.strip() != "id"]
+        unknown = [name for name in requested if name not in ARTICLE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return [name for name in ARTICLE_FIELDS if name in requested]
+    return CARD_FIELDS if view == "card" else None
+
+def list_projection(fields: Optional[List[str]]) -> Optional[dict]:
+    """Mongo projection that reads only what `fields` needs"""
+    if fields is None:
+        return None
+    projection = {name: 1 for name in fields}
+    if "content" in fields:
+        # content falls back to description
+        projection["description"] = 1
+    # Keyset cursors are built from the sort keys
+    projection["publishedAt"] = 1
+    projection["createdAt"] = 1
+    return projection
+
+def project_article(article: dict, fields: Optional[List[str]]) -> dict:
+    """Trim an already serialised article to `fields`"""
+    if fields is None:
+        return article
+    return {"id": article["id"], **{name: article[name] for name in fields}}
 
 @router.get("/", response_model=dict)
 async def get_news(
@@ -34,9 +113,35 @@ async def get_news(
     limit: int = Query(20, ge=1, le=100),
     category: Optional[str] = None,
     language: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: str = Query("card", pattern="^(card|full)$"),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get news with filters"""
+    """Get news with filters - pass `cursor` (from `next_cursor`) for keyset pagination.
+    
+    Cards leave out `content` by default; use `view=full` or a `fields=` list to choose.
+    """
+    selected = resolve_fields(view, fields)
+    key = cache_key(
+        "news", page=page, limit=limit, category=category, language=language, search=search,
+        cursor=cursor, fields=",".join(selected) if selected is not None else "all"
+    )
+    cached = await response_cache.get_or_set(
+        key, lambda: _news_page(page, limit, category, language, search, cursor, selected)
+    )
+    return json_response(cached, if_none_match, FEED_CACHE_CONTROL)
+
+async def _news_page(page: int, limit: int, category: Optional[str], language: Optional[str],
+                     search: Optional[str], cursor: Optional[str], fields: Optional[List[str]]) -> bytes:
+    # Plain language/category pages come straight from the materialised home feeds
+    if not search and not cursor:
+        feed_page = home_feeds.page(language, category, page, limit)
+        if feed_page is not None:
+            feed_page["articles"] = [project_article(article, fields) for article in feed_page["articles"]]
+            return render_json(feed_page)
+    
     db = get_database()
     collection = db["news"]
     
@@ -49,58 +154,163 @@ async def get_news(
     if category and category != "":
         query["category"] = category
     
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
+    # Full-text search on the news_text index. Tokenising drops $text operators
+    # (quotes, leading "-"), so user input is always matched as literal words.
+    search_terms = text_search_terms(search)
+    if search and not search_terms:
+        return render_json({
+            "articles": [], "total": 0, "page": page, "limit": limit, "pages": 0,
+            "total_exact": True, "next_cursor": None
+        })
+    if search_terms:
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported with search - use page")
+        query["$text"] = {"$search": search_terms}
     
     # Also filter out articles with missing data
     query["title"] = {"$exists": True, "$ne": ""}
     query["description"] = {"$exists": True, "$ne": ""}
     
-    total = await collection.count_documents(query)
-    skip = (page - 1) * limit
-    # cursor = collection.find(query).sort("publishedAt", -1).skip(skip).limit(limit)
-    cursor = collection.find(query).sort([
-    ("publishedAt", -1),
-    ("createdAt", -1)
-]).skip(skip).limit(limit)
-    articles = []
-    async for doc in cursor:
-        articles.append(serialize_news(doc))
+    # Counting is the expensive half of a feed request - cached per filter,
+    # estimated from collection metadata when nothing is filtered
+    filtered = bool(language or category or search)
+    total, total_exact = await count_cache.count(collection, query, filtered)
     
-    return {
+    projection = list_projection(fields)
+    
+    if cursor:
+        # Keyset mode: continue after the last item with a range predicate instead of skip()
+        try:
+            page_query = {"$and": [query, after_cursor(cursor)]}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cursor_result = collection.find(page_query, projection).sort(FEED_SORT).limit(limit)
+    elif search_terms:
+        # Best matches first, newest first among equal scores
+        skip = (page - 1) * limit
+        score_projection = {**(projection or {}), "score": {"$meta": "textScore"}}
+        cursor_result = collection.find(query, score_projection).sort([("score", {"$meta": "textScore"})] + FEED_SORT).skip(skip).limit(limit)
+    else:
+        skip = (page - 1) * limit
+        cursor_result = collection.find(query, projection).sort(FEED_SORT).skip(skip).limit(limit)
+    
+    docs = await cursor_result.to_list(limit)
+    articles = [serialize_news(doc, fields) for doc in docs]
+    
+    return render_json({
         "articles": articles,
         "total": total,
         "page": page,
         "limit": limit,
-        "pages": (total + limit - 1) // limit if total > 0 else 0
-    }
+        "pages": (total + limit - 1) // limit if total > 0 else 0,
+        "total_exact": total_exact,
+        "next_cursor": encode_cursor(docs[-1]) if len(docs) == limit and not search_terms else None
+    })
 
 @router.get("/trending", response_model=List[NewsResponse])
-async def get_trending_news(limit: int = Query(10, ge=1, le=50)):
-    """Get trending news"""
-    db = get_database()
-    collection = db["news"]
-    
-    # Filter out incomplete articles
-    query = {
-        "title": {"$exists": True, "$ne": ""},
-        "description": {"$exists": True, "$ne": ""}
-    }
-    
-    cursor = collection.find(query).sort("publishedAt", -1).limit(limit)
+async def get_trending_news(
+    limit: int = Query(10, ge=1, le=50),
+    view: str = Query("card", pattern="^(card|full)$"),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Most popular recent news (views and summary requests decayed by age) -
+    cards by default, `view=full` or `fields=` to choose"""
+    selected = resolve_fields(view, fields)
+    # Empty selections (fields=id) must not collapse onto the default key
+    key = cache_key("trending", limit=limit, fields=",".join(selected) if selected is not None else "all")
+    cached = await response_cache.get_or_set(key, lambda: _trending(limit, selected))
+    return json_response(cached, if_none_match, FEED_CACHE_CONTROL)
+
+async def _trending(limit: int, fields: Optional[List[str]]) -> bytes:
+    if trending_service.ready:
+        articles = [serialize_news(doc, fields) for doc in trending_service.top(limit)]
+    else:
+        # Ranking not computed yet (startup) - fall back to the newest articles
+        db = get_database()
+        collection = db["news"]
+        
+        # Filter out incomplete articles
+        query = {
+            "title": {"$exists": True, "$ne": ""},
+            "description": {"$exists": True, "$ne": ""}
+        }
+        
+        cursor = collection.find(query, list_projection(fields)).sort("publishedAt", -1).limit(limit)
+        
+        articles = []
+        async for doc in cursor:
+            articles.append(serialize_news(doc, fields))
     
-    articles = []
-    async for doc in cursor:
-        articles.append(serialize_news(doc))
+    # Cards and sparse fieldsets look exactly like /api/news items - fields left
+    # out by the view are absent, never null
+    if fields is not None:
+        return render_json(articles)
     
-    return articles
+    # Same bytes response_model=List[NewsResponse] produced, without per-item validation
+    return render_json([as_news_response(article) for article in articles])
+
+# Upper bound on ids per batch request
+BATCH_MAX_IDS = 50
+
+@router.get("/batch")
+async def get_articles_batch(
+    ids: str = Query(..., description="Comma-separated article ids"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Several articles in one round trip, in the requested order.
+
+    Each item is `{"id", "status": "ok", "article"}` or has status
+    `not_found` / `invalid_id`, so one bad id doesn't fail the batch.
+    """
+    requested = [article_id.strip() for article_id in ids.split(",") if article_id.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="No article ids given")
+    if len(requested) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per batch")
+
+    # Canonical (lowercase hex) form of each valid id - the cache and results are keyed on it
+    canonical = {article_id: str(ObjectId(article_id)) for article_id in requested if ObjectId.is_valid(article_id)}
+
+    # Article bodies already in the single-article cache are reused as-is
+    bodies = {}
+    missing = set()
+    for object_id in set(canonical.values()):
+        cached = response_cache.get(cache_key(f"article/{object_id}"))
+        if cached is not None:
+            bodies[object_id] = cached.body
+        else:
+            missing.add(object_id)
+
+    if missing:
+        db = get_database()
+        cursor = db["news"].find({"_id": {"$in": [ObjectId(object_id) for object_id in missing]}})
+        async for doc in cursor:
+            object_id = str(doc["_id"])
+            body = render_json(as_news_response(serialize_news(doc)))
+            bodies[object_id] = response_cache.set(cache_key(f"article/{object_id}"), body).body
+
+    # Splice the cached article bytes into the envelope instead of re-encoding them,
+    # echoing each id as the client sent it
+    items = []
+    for article_id in requested:
+        object_id = canonical.get(article_id)
+        if object_id in bodies:
+            items.append(b'{"id":' + render_json(article_id) + b',"status":"ok","article":' + bodies[object_id] + b"}")
+        else:
+            status = "not_found" if object_id else "invalid_id"
+            items.append(render_json({"id": article_id, "status": status}))
+    body = b'{"articles":[' + b",".join(items) + b"]}"
+    return json_response(CachedResponse(body, make_etag(body)), if_none_match, ARTICLE_CACHE_CONTROL)
 
 @router.get("/{article_id}", response_model=NewsResponse)
-async def get_article(article_id: str):
+async def get_article(article_id: str, if_none_match: Optional[str] = Header(None)):
     """Get single article"""
+    trending_service.record_view(article_id)
+    cached = await response_cache.get_or_set(cache_key(f"article/{article_id}"), lambda: _article(article_id))
+    return json_response(cached, if_none_match, ARTICLE_CACHE_CONTROL)
+
+async def _article(article_id: str) -> bytes:
     db = get_database()
     collection = db["news"]
     
@@ -108,13 +318,35 @@ async def get_article(article_id: str):
         doc = await collection.find_one({"_id": ObjectId(article_id)})
         if not doc:
             raise HTTPException(status_code=404, detail="Article not found")
-        return serialize_news(doc)
+        return render_json(as_news_response(serialize_news(doc)))
     except:
         raise HTTPException(status_code=400, detail="Invalid article ID")
 
+@router.get("/jobs/{job_id}")
+async def get_summary_job(job_id: str):
+    """Status of a summary job - `result` holds the summary once it is done"""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    job = await summary_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "jobId": str(job["_id"]),
+        "articleId": job["articleId"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "result": job.get("result"),
+        "error": job.get("error")
+    }
+
 @router.post("/{article_id}/summarize")
-async def generate_article_summary(article_id: str):
-    """Generate comprehensive AI summary - FIXED"""
+async def generate_article_summary(article_id: str, wait: bool = Query(True)):
+    """Generate comprehensive AI summary - FIXED
+    
+    With `wait=false` a missing summary is queued instead: the response is
+    202 with a job id to poll at /api/news/jobs/{job_id}.
+    """
+    trending_service.record_summary_request(article_id)
     db = get_database()
     collection = db["news"]
     
@@ -123,41 +355,20 @@ async def generate_article_summary(article_id: str):
         if not doc:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        if doc.get("aiSummary") and len(doc.get("aiSummary", "")) > 100:
-            return {
-                "summary": doc["aiSummary"],
-                "audioUrl": doc.get("audioSummaryUrl"),
-                "cached": True
-            }
-        
-        title = doc.get("title", "")
-        description = doc.get("description", "")
-        content = doc.get("content", "")
-        url = doc.get("url", "")
-        language = doc.get("language", "en")
-        
-        print(f"Generating summary for: {title[:50]}...")
-        
-        summary = await ai_summarizer.generate_summary(
-            title=title,
-            description=description,
-            content=content,
-            url=url,
-            language=language
-        )
-        
-        print(f"Summary generated: {len(summary)} chars")
-        
-        audio_url = ai_summarizer.generate_audio_summary(summary, language)
-        
-        await collection.update_one(
-            {"_id": ObjectId(article_id)},
-            {"$set": {"aiSummary": summary, "audioSummaryUrl": audio_url, "updatedAt": datetime.utcnow()}}
-        )
+        if not wait:
+            cached = stored_summary(doc)
+            if cached:
+                return cached
+            job = await summary_jobs.enqueue(article_id)
+            return JSONResponse(status_code=202, content={
+                "jobId": str(job["_id"]),
+                "status": job["status"],
+                "statusUrl": f"/api/news/jobs/{job['_id']}"
+            })
         
-        return {"summary": summary, "audioUrl": audio_url, "cached": False}
+        return await summary_jobs.summarize(doc)
     except Exception as e:
         print(f"Summary error: {e}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
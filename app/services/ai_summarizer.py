@@ -1,6 +1,12 @@
-import httpx
 from app.config import settings
+from app.services.http_client import http_clients
+from app.services.tts_pool import tts_pool
+from app.utils.audio_files import audio_filename
+from app.utils.html_text import ArticleTextExtractor
 from gtts import gTTS
+import asyncio
+import codecs
+import os
 import uuid
 from pathlib import Path
 import re
@@ -11,6 +17,7 @@ class AISummarizer:
         self.gemini_api_key = settings.gemini_api_key
         self.audio_dir = Path("static/audio")
         self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.audio_inflight = {}  # filename -> synthesis future
     
     def clean_content(self, text: str) -> str:
         """Remove truncation markers and clean text"""
@@ -21,25 +28,30 @@ class AISummarizer:
         return text.strip()
     
     async def fetch_article_content(self, url: str) -> str:
-        """Fetch full article from URL"""
+        """Fetch article text from URL, streaming at most ARTICLE_FETCH_MAX_BYTES"""
         try:
             print(f"🌐 Fetching: {url[:60]}...")
             
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=15.0, follow_redirects=True, headers=headers)
+            # Shared publisher pool sends the browser User-Agent and follows redirects
+            client = http_clients.get("publisher")
+            async with client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return ""
                 
-                if response.status_code == 200:
-                    html = response.text
-                    # Remove noise
-                    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-                    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-                    html = re.sub(r'<nav[^>]*>.*?</nav>', '', html, flags=re.DOTALL | re.IGNORECASE)
-                    text = re.sub(r'<[^>]+>', ' ', html)
-                    text = ' '.join(text.split())
-                    print(f"✅ Extracted {len(text[:5000])} chars")
-                    return text[:5000]
+                # Parse as the body arrives and stop at enough text or the byte cap
+                extractor = ArticleTextExtractor(max_chars=settings.article_text_max_chars)
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if extractor.done or received >= settings.article_fetch_max_bytes:
+                        break
+                extractor.close()
+            
+            text = extractor.text()
+            print(f"✅ Extracted {len(text)} chars from {received / 1024:.0f} KB")
+            return text
                     
         except Exception as e:
             print(f"❌ Fetch error: {e}")
@@ -146,25 +158,24 @@ class AISummarizer:
             else:
                 prompt = f"Write a complete 5-6 sentence summary:\n\n{combined}"
             
-            async with httpx.AsyncClient() as client:
-                for endpoint in model_endpoints:
-                    try:
-                        response = await client.post(
-                            f"{endpoint}?key={self.gemini_api_key}",
-                            json={
-                                "contents": [{"parts": [{"text": prompt}]}],
-                                "generationConfig": {"temperature": 0.7, "maxOutputTokens": 1500}
-                            },
-                            timeout=20.0
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            summary = result["candidates"][0]["content"]["parts"][0]["text"]
-                            if len(summary) > 100:
-                                return summary.strip()
-                    except:
-                        continue
+            client = http_clients.get("gemini")
+            for endpoint in model_endpoints:
+                try:
+                    response = await client.post(
+                        f"{endpoint}?key={self.gemini_api_key}",
+                        json={
+                            "contents": [{"parts": [{"text": prompt}]}],
+                            "generationConfig": {"temperature": 0.7, "maxOutputTokens": 1500}
+                        }
+                    )
+                    
+                    if response.status_code == 200:
+                        result = response.json()
+                        summary = result["candidates"][0]["content"]["parts"][0]["text"]
+                        if len(summary) > 100:
+                            return summary.strip()
+                except:
+                    continue
         except:
             pass
         return None
@@ -177,39 +188,65 @@ class AISummarizer:
             
             text = f"{title}. {description}. {content}"[:1000]
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    API_URL,
-                    headers=headers,
-                    json={"inputs": text, "parameters": {"max_length": 200, "min_length": 100}},
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if isinstance(result, list) and result:
-                        return result[0].get("summary_text", "")
+            client = http_clients.get("huggingface")
+            response = await client.post(
+                API_URL,
+                headers=headers,
+                json={"inputs": text, "parameters": {"max_length": 200, "min_length": 100}}
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if isinstance(result, list) and result:
+                    return result[0].get("summary_text", "")
         except:
             pass
         return None
     
-    def generate_audio_summary(self, summary: str, language: str = "en") -> str:
-        """Generate audio from summary"""
+    async def generate_audio_summary(self, summary: str, language: str = "en") -> str:
+        """Generate audio from summary (synthesised in the TTS pool, off the event loop)"""
         try:
             if not summary or len(summary) < 20:
                 return None
             
             lang_code = "hi" if language == "hi" else "en"
-            filename = f"{uuid.uuid4()}.mp3"
+            # Content-addressed: the same text (e.g. cloned articles) maps to one file
+            filename = audio_filename(summary, lang_code)
             filepath = self.audio_dir / filename
             
-            tts = gTTS(text=summary, lang=lang_code, slow=False)
-            tts.save(str(filepath))
+            if filepath.exists():
+                # Fresh mtime keeps the audio GC's min-age guard until the article is saved
+                os.utime(filepath)
+                print(f"🔊 Audio reused: {filename}")
+                return f"/static/audio/{filename}"
+            
+            # Concurrent requests for the same text share one synthesis
+            synthesis = self.audio_inflight.get(filename)
+            if synthesis is None:
+                synthesis = asyncio.ensure_future(tts_pool.run(self._synthesize, summary, lang_code, filepath))
+                self.audio_inflight[filename] = synthesis
+                synthesis.add_done_callback(lambda _: self.audio_inflight.pop(filename, None))
+            await asyncio.shield(synthesis)
             print(f"🔊 Audio saved: {filename}")
             return f"/static/audio/{filename}"
             
+        except asyncio.TimeoutError:
+            print(f"Audio error: synthesis timed out after {tts_pool.timeout}s")
+            return None
         except Exception as e:
             print(f"Audio error: {e}")
             return None
+    
+    def _synthesize(self, summary: str, lang_code: str, filepath: Path):
+        """Blocking gTTS call - runs in a TTS pool thread"""
+        tts = gTTS(text=summary, lang=lang_code, slow=False)
+        # Write under a temporary name so a half-written file is never served or reused
+        partial = filepath.with_name(f"{filepath.name}.{uuid.uuid4().hex}.part")
+        try:
+            tts.save(str(partial))
+            os.replace(partial, filepath)
+        finally:
+            if partial.exists():
+                partial.unlink()
 
 ai_summarizer = AISummarizer()
\ No newline at end of file
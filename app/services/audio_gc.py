@@ -0,0 +1,70 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from app.config import settings
+from app.database import get_database
+
+AUDIO_DIR = Path("static/audio")
+AUDIO_URL_PREFIX = "/static/audio/"
+
+async def collect_orphaned_audio(batch_size: int = None, min_age_minutes: int = None) -> dict:
+    """Delete MP3s in static/audio that no stored article references.
+
+    Files are checked against `audioSummaryUrl` in batches with one `$in`
+    query each. Files younger than `min_age_minutes` are skipped, since a
+    summary may have written its audio and not yet saved the article.
+    """
+    batch_size = batch_size or settings.audio_gc_batch_size
+    min_age_minutes = settings.audio_gc_min_age_minutes if min_age_minutes is None else min_age_minutes
+    cutoff = time.time() - min_age_minutes * 60
+    collection = get_database()["news"]
+
+    report = {"scanned": 0, "deleted": 0, "bytes_reclaimed": 0, "errors": 0}
+    if not AUDIO_DIR.exists():
+        return report
+
+    async def sweep(batch):
+        urls = [AUDIO_URL_PREFIX + entry.name for entry, _ in batch]
+        referenced = set()
+        cursor = collection.find({"audioSummaryUrl": {"$in": urls}}, {"audioSummaryUrl": 1})
+        async for doc in cursor:
+            referenced.add(doc["audioSummaryUrl"])
+
+        for entry, size in batch:
+            if AUDIO_URL_PREFIX + entry.name in referenced:
+                continue
+            try:
+                os.unlink(entry.path)
+                report["deleted"] += 1
+                report["bytes_reclaimed"] += size
+            except FileNotFoundError:
+                # Another worker process on this host swept it first
+                continue
+            except OSError as e:
+                report["errors"] += 1
+                print(f"⚠️ Could not delete {entry.name}: {e}")
+
+    batch = []
+    with os.scandir(AUDIO_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(".mp3"):
+                continue
+            stat = entry.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            report["scanned"] += 1
+            batch.append((entry, stat.st_size))
+            if len(batch) >= batch_size:
+                await sweep(batch)
+                batch = []
+                # Let request handlers run between batches
+                await asyncio.sleep(0)
+    if batch:
+        await sweep(batch)
+
+    print(
+        f"🧹 Audio GC: {report['deleted']}/{report['scanned']} files removed, "
+        f"{report['bytes_reclaimed'] / 1024 / 1024:.1f} MB reclaimed"
+    )
+    return report
@@ -0,0 +1,51 @@
+import json
+import time
+from app.config import settings
+
+class CountCache:
+    """Total-count cache for feed queries, keyed by the normalised filter.
+
+    Entries expire after `ttl` seconds and the whole cache is dropped whenever
+    ingest or cleanup changes the `news` collection.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}  # key -> (total, expires_at)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, query: dict) -> str:
+        return json.dumps(query, sort_keys=True, default=str)
+
+    async def count(self, collection, query: dict, filtered: bool = True) -> tuple:
+        """(total, exact) for `query`.
+
+        Unfiltered feeds use the collection metadata count, which is instant
+        but ignores the title/description guards, so it is reported inexact.
+        """
+        if not filtered:
+            return await collection.estimated_document_count(), False
+
+        key = self._key(query)
+        entry = self.entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0], True
+
+        self.misses += 1
+        total = await collection.count_documents(query)
+        if len(self.entries) >= self.max_entries:
+            # Dicts keep insertion order - drop the oldest entry
+            self.entries.pop(next(iter(self.entries)))
+        self.entries[key] = (total, time.monotonic() + self.ttl)
+        return total, True
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+count_cache = CountCache(settings.count_cache_ttl_seconds)
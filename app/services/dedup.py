@@ -0,0 +1,160 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from app.config import settings
+from app.database import get_database
+from app.utils.text import tokenize
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Each fingerprint bit gets its own 16-bit lane in one big integer, so the
+# per-bit counts for all features are summed with plain integer additions
+# instead of a 64-step Python loop per feature.
+LANE_BITS = 16
+LANE_MASK = (1 << LANE_BITS) - 1
+SPREAD_BYTE = [
+    sum(1 << (bit * LANE_BITS) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams"""
+    tokens = tokenize(text)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+
+    lanes = 0
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        for index, byte in enumerate(digest):
+            lanes += SPREAD_BYTE[byte] << (index * 8 * LANE_BITS)
+
+    # A bit is set when more than half of the features have it set
+    half = len(features) // 2
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if (lanes >> (bit * LANE_BITS)) & LANE_MASK > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+class NearDuplicateIndex:
+    """In-memory SimHash index with LSH banding.
+
+    The 64-bit fingerprint is split into 4 bands of 16 bits. Two fingerprints
+    within Hamming distance 3 must agree on at least one band, so a lookup only
+    compares against the few entries sharing a band instead of the whole index.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = min(max_distance, BANDS - 1)
+        self.entries = {}  # url -> (fingerprint, clusterId, createdAt)
+        self.bands = [{} for _ in range(BANDS)]  # band value -> set of urls
+        self.checks = 0
+        self.duplicates = 0
+        self.check_time = 0.0
+
+    def _band_keys(self, fingerprint: int):
+        return [(fingerprint >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+    def _add(self, url: str, fingerprint: int, cluster_id: str, created_at: datetime, duplicate: bool = False):
+        self.entries[url] = (fingerprint, cluster_id, created_at, duplicate)
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            band.setdefault(key, set()).add(url)
+
+    def _remove(self, url: str):
+        fingerprint, _, _, _ = self.entries.pop(url)
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            members = band.get(key)
+            if members:
+                members.discard(url)
+                if not members:
+                    del band[key]
+
+    def _nearest(self, fingerprint: int):
+        """clusterId of the closest indexed fingerprint within max_distance"""
+        best = None
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            for url in band.get(key, ()):
+                other, cluster_id, _, _ = self.entries[url]
+                distance = bin(fingerprint ^ other).count("1")
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, cluster_id)
+        return best[1] if best else None
+
+    def check(self, url: str, title: str, description: str) -> dict:
+        """Look up an article and index it.
+
+        Returns {"clusterId", "duplicate", "indexed"}, where `indexed` says
+        this call added the url (so the caller can `forget` it if the store
+        fails). A url that is already indexed gets its first verdict again (so
+        a dropped near-duplicate stays dropped when another feed returns it) -
+        it is never matched against itself, and exact url matches are left to
+        the unique index.
+        """
+        started = time.perf_counter()
+        self.checks += 1
+
+        if url in self.entries:
+            _, cluster_id, _, duplicate = self.entries[url]
+            result = {"clusterId": cluster_id, "duplicate": duplicate, "indexed": False}
+        else:
+            fingerprint = simhash(f"{title or ''} {description or ''}")
+            cluster_id = self._nearest(fingerprint) if fingerprint else None
+            duplicate = cluster_id is not None
+            if not duplicate:
+                cluster_id = f"{fingerprint:016x}"
+            else:
+                self.duplicates += 1
+            self._add(url, fingerprint, cluster_id, datetime.utcnow(), duplicate)
+            result = {"clusterId": cluster_id, "duplicate": duplicate, "indexed": True}
+
+        self.check_time += time.perf_counter() - started
+        return result
+
+    def forget(self, url: str):
+        """Drop an entry whose article was not stored after all"""
+        if url in self.entries:
+            self._remove(url)
+
+    def prune(self, cutoff: datetime) -> int:
+        """Drop entries indexed before `cutoff`"""
+        stale = [url for url, (_, _, created_at, _) in self.entries.items() if created_at < cutoff]
+        for url in stale:
+            self._remove(url)
+        return len(stale)
+
+    async def load(self, days: int = 7):
+        """Rebuild the index from articles stored in the last `days` days"""
+        db = get_database()
+        since = datetime.utcnow() - timedelta(days=days)
+        cursor = db["news"].find(
+            {"createdAt": {"$gte": since}},
+            {"url": 1, "title": 1, "description": 1, "clusterId": 1, "createdAt": 1}
+        ).sort("createdAt", 1)
+
+        loaded = 0
+        async for doc in cursor:
+            url = doc.get("url")
+            if not url or url in self.entries:
+                continue
+            fingerprint = simhash(f"{doc.get('title') or ''} {doc.get('description') or ''}")
+            cluster_id = doc.get("clusterId") or self._nearest(fingerprint) or f"{fingerprint:016x}"
+            self._add(url, fingerprint, cluster_id, doc.get("createdAt") or datetime.utcnow())
+            loaded += 1
+
+        print(f"🧬 Near-duplicate index loaded: {loaded} articles")
+        return loaded
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "checks": self.checks,
+            "duplicates": self.duplicates,
+            "avg_check_ms": round(self.check_time / self.checks * 1000, 4) if self.checks else 0.0
+        }
+
+near_duplicate_index = NearDuplicateIndex(settings.near_duplicate_max_distance)
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from typing import List
+from pymongo import UpdateOne
+from app.config import settings
+from app.database import get_database
+
+# Persisted per-feed fields, stored under "schedule" in the feed's watermark doc
+STATE_FIELDS = ["intervalMinutes", "yieldEwma", "lastYield", "lastRunAt", "nextDueAt"]
+
+class FeedSchedule:
+    """Per-feed refresh intervals adapted to how many new articles each run yields.
+
+    Feeds that keep producing new articles are refreshed more often, quiet
+    ones back off, each within [min, max] minutes. The intervals are then
+    stretched together whenever the planned calls per day would exceed the
+    NewsAPI daily quota. The learned state is kept next to each feed's
+    watermark in `feed_watermarks`, so deploys and leader failovers carry on
+    with it instead of making every feed due at once.
+    """
+
+    def __init__(self):
+        self.min_interval = settings.adaptive_min_interval_minutes
+        self.max_interval = settings.adaptive_max_interval_minutes
+        self.target_yield = settings.adaptive_target_yield
+        self.daily_quota = settings.newsapi_daily_quota
+        self.feeds = {}  # "category/language" -> state
+        self.loaded = False
+
+    def _state(self, category: str, language: str) -> dict:
+        key = f"{category}/{language}"
+        if key not in self.feeds:
+            self.feeds[key] = {
+                "category": category,
+                "language": language,
+                "intervalMinutes": float(settings.adaptive_default_interval_minutes),
+                "yieldEwma": None,
+                "lastYield": None,
+                "lastRunAt": None,
+                "nextDueAt": None,
+            }
+        return self.feeds[key]
+
+    async def reload(self):
+        """Drop the in-memory state and read it back - run on becoming leader,
+        since another leader may have fetched and rescheduled feeds meanwhile"""
+        self.feeds = {}
+        self.loaded = False
+        await self.load()
+    
+    async def load(self):
+        """Restore the persisted per-feed state (once per process, see `reload`)"""
+        if self.loaded:
+            return
+        cursor = get_database()["feed_watermarks"].find({"schedule": {"$exists": True}}, {"schedule": 1})
+        async for doc in cursor:
+            category, _, language = doc["_id"].partition("/")
+            state = self._state(category, language)
+            state.update({name: doc["schedule"].get(name, state[name]) for name in STATE_FIELDS})
+        self.loaded = True
+
+    async def _persist(self):
+        """Save every feed's state - a quota stretch can change all of them"""
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$set": {"schedule": {name: state[name] for name in STATE_FIELDS}}},
+                upsert=True
+            )
+            for key, state in self.feeds.items()
+        ]
+        if operations:
+            await get_database()["feed_watermarks"].bulk_write(operations, ordered=False)
+
+    async def due_feeds(self, feeds: List[tuple]) -> List[tuple]:
+        """Feeds whose interval has elapsed (never-fetched feeds are always due)"""
+        await self.load()
+        now = datetime.utcnow()
+        due = []
+        for category, language in feeds:
+            next_due = self._state(category, language)["nextDueAt"]
+            if next_due is None or next_due <= now:
+                due.append((category, language))
+        return due
+
+    async def record(self, batch: dict):
+        """Post-ingest hook: update a feed's interval from the batch's yield"""
+        await self.load()
+        state = self._state(batch["category"], batch["language"])
+        saved = batch.get("saved", 0)
+
+        state["yieldEwma"] = saved if state["yieldEwma"] is None else 0.5 * state["yieldEwma"] + 0.5 * saved
+        state["lastYield"] = saved
+        state["lastRunAt"] = datetime.utcnow()
+
+        # More new articles than the target -> shorter interval, fewer -> longer,
+        # at most halving/doubling per run
+        factor = self.target_yield / max(state["yieldEwma"], 0.5)
+        factor = min(2.0, max(0.5, factor))
+        interval = state["intervalMinutes"] * factor
+        state["intervalMinutes"] = min(self.max_interval, max(self.min_interval, interval))
+
+        self._apply_quota()
+        try:
+            await self._persist()
+        except Exception as e:
+            print(f"⚠️ Feed schedule persist failed: {e}")
+
+    def _apply_quota(self):
+        """Stretch every interval evenly if the plan exceeds the daily quota"""
+        calls_per_day = sum(1440 / state["intervalMinutes"] for state in self.feeds.values())
+        if calls_per_day > self.daily_quota:
+            stretch = calls_per_day / self.daily_quota
+            for state in self.feeds.values():
+                state["intervalMinutes"] *= stretch
+
+        for state in self.feeds.values():
+            if state["lastRunAt"] is not None:
+                state["nextDueAt"] = state["lastRunAt"] + timedelta(minutes=state["intervalMinutes"])
+
+    def stats(self) -> dict:
+        return {
+            "dailyQuota": self.daily_quota,
+            "plannedCallsPerDay": round(sum(1440 / state["intervalMinutes"] for state in self.feeds.values()), 1),
+            "feeds": {
+                key: {
+                    "intervalMinutes": round(state["intervalMinutes"], 1),
+                    "yieldEwma": round(state["yieldEwma"], 2) if state["yieldEwma"] is not None else None,
+                    "lastYield": state["lastYield"],
+                    "nextDueAt": state["nextDueAt"],
+                }
+                for key, state in self.feeds.items()
+            }
+        }
+
+feed_schedule = FeedSchedule()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.database import get_database
+from app.services.response_cache import response_cache
+from app.utils.pagination import FEED_SORT, encode_cursor
+
+LANGUAGES = ["en", "hi"]
+
+class HomeFeeds:
+    """First-N articles for every language x category filter, held in memory.
+
+    Rebuilt in the background whenever ingest or cleanup changes the data
+    (and when older than HOME_FEED_MAX_AGE_SECONDS, so workers that don't
+    ingest catch up). A rebuild fills a new dict and swaps it in one
+    assignment, so readers never see a half-built set.
+    """
+
+    def __init__(self):
+        self.size = settings.home_feed_size
+        self.max_age = settings.home_feed_max_age_seconds
+        self.feeds = {}  # (language, category or None) -> feed
+        self.built_at = None
+        self.refresh_task = None
+        self.dirty = False  # changed while a rebuild was running
+        self.hits = 0
+        self.builds = 0
+
+    def _query(self, language: str, category: Optional[str]) -> dict:
+        # Same filter get_news builds for a language/category page
+        query = {"language": language}
+        if category:
+            query["category"] = category
+        query["title"] = {"$exists": True, "$ne": ""}
+        query["description"] = {"$exists": True, "$ne": ""}
+        return query
+
+    async def _build_feed(self, collection, language: str, category: Optional[str]) -> dict:
+        # Import here to avoid circular dependency (routes import the services)
+        from app.routes.news import serialize_news
+
+        query = self._query(language, category)
+        docs = await collection.find(query).sort(FEED_SORT).limit(self.size).to_list(self.size)
+        total = await collection.count_documents(query)
+        return {
+            "articles": [serialize_news(doc) for doc in docs],
+            "cursors": [encode_cursor(doc) for doc in docs],
+            "total": total,
+        }
+
+    async def refresh(self):
+        """Rebuild every feed and swap them in atomically"""
+        from app.services.news_fetcher import news_fetcher
+
+        started = time.perf_counter()
+        db = get_database()
+        collection = db["news"]
+        keys = [(language, category) for language in LANGUAGES for category in [None] + news_fetcher.categories]
+        built = await asyncio.gather(*(self._build_feed(collection, *key) for key in keys))
+
+        self.feeds = dict(zip(keys, built))
+        self.built_at = time.monotonic()
+        # Responses cached from the previous feeds are stale now
+        response_cache.invalidate()
+        self.builds += 1
+        print(f"🏠 Home feeds rebuilt: {len(keys)} feeds in {time.perf_counter() - started:.2f}s")
+
+        if settings.home_feed_persist:
+            await self._persist(db)
+
+    async def _persist(self, db):
+        collection = db["home_feeds"]
+        now = datetime.utcnow()
+        for (language, category), feed in self.feeds.items():
+            await collection.replace_one(
+                {"_id": f"{language}/{category or 'all'}"},
+                {"articles": feed["articles"], "total": feed["total"], "builtAt": now},
+                upsert=True
+            )
+
+    def schedule_refresh(self):
+        """Rebuild in the background, coalescing bursts of changes into one rebuild"""
+        if self.refresh_task and not self.refresh_task.done():
+            # A rebuild may already be past its queries - run one more after it
+            self.dirty = True
+            return
+
+        async def run():
+            self.dirty = True
+            while self.dirty:
+                self.dirty = False
+                # Let the rest of an ingest run land first
+                await asyncio.sleep(1.0)
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Home feed rebuild failed: {e}")
+
+        try:
+            self.refresh_task = asyncio.get_running_loop().create_task(run())
+        except RuntimeError:
+            # No running loop (scripts) - the next request rebuilds them
+            self.feeds = {}
+
+    def page(self, language: Optional[str], category: Optional[str], page: int, limit: int) -> Optional[dict]:
+        """A feed page in get_news' response shape, or None if it isn't materialised"""
+        if language not in LANGUAGES:
+            return None
+        if self.built_at is None or time.monotonic() - self.built_at > self.max_age:
+            self.schedule_refresh()
+        feed = self.feeds.get((language, category or None))
+        if feed is None:
+            return None
+
+        start = (page - 1) * limit
+        end = start + limit
+        # Pages past the materialised window fall back to Mongo unless the feed is exhausted
+        if end > len(feed["articles"]) and len(feed["articles"]) < feed["total"]:
+            return None
+
+        self.hits += 1
+        total = feed["total"]
+        articles = feed["articles"][start:end]
+        return {
+            "articles": articles,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit if total > 0 else 0,
+            "total_exact": True,
+            "next_cursor": feed["cursors"][end - 1] if len(articles) == limit else None
+        }
+
+    def stats(self) -> dict:
+        return {
+            "feeds": len(self.feeds),
+            "size": self.size,
+            "builds": self.builds,
+            "hits": self.hits,
+            "age_s": round(time.monotonic() - self.built_at, 1) if self.built_at else None,
+        }
+
+home_feeds = HomeFeeds()
@@ -0,0 +1,94 @@
+import httpx
+import importlib.util
+from app.config import settings
+
+# Per-upstream pool sizing and timeouts. Timeouts match the values the
+# individual calls used before the clients were shared.
+UPSTREAMS = {
+    "newsapi": {"timeout": 30.0, "max_connections": 10, "max_keepalive": 5},
+    "publisher": {
+        "timeout": 15.0,
+        "max_connections": 20,
+        "max_keepalive": 10,
+        "follow_redirects": True,
+        "headers": {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+    },
+    "gemini": {"timeout": 20.0, "max_connections": 10, "max_keepalive": 5},
+    "huggingface": {"timeout": 30.0, "max_connections": 5, "max_keepalive": 2},
+}
+
+class HTTPClientManager:
+    """Application-scoped httpx clients, one connection pool per upstream.
+
+    Opened and closed by the FastAPI lifespan. `get()` also opens a client
+    lazily so scripts and the scheduler work outside the app.
+    """
+
+    def __init__(self):
+        self.clients = {}
+        self.request_counts = {name: 0 for name in UPSTREAMS}
+        # HTTP/2 needs the optional `h2` package (httpx[http2])
+        self.http2 = settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+    def _create_client(self, name: str) -> httpx.AsyncClient:
+        config = UPSTREAMS[name]
+
+        async def count_request(request):
+            self.request_counts[name] += 1
+
+        return httpx.AsyncClient(
+            http2=self.http2,
+            timeout=httpx.Timeout(config["timeout"], connect=min(10.0, config["timeout"])),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive"],
+                keepalive_expiry=30.0
+            ),
+            follow_redirects=config.get("follow_redirects", False),
+            headers=config.get("headers"),
+            event_hooks={"request": [count_request]}
+        )
+
+    async def start(self):
+        """Open a client for every upstream"""
+        for name in UPSTREAMS:
+            self.get(name)
+        print(f"✅ HTTP clients ready (http2={self.http2})")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Shared client for an upstream: newsapi, publisher, gemini or huggingface"""
+        client = self.clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(name)
+            self.clients[name] = client
+        return client
+
+    async def close(self):
+        """Close every pool"""
+        for client in self.clients.values():
+            await client.aclose()
+        self.clients = {}
+        print("Closed HTTP clients")
+
+    def stats(self) -> dict:
+        """Pool usage per upstream"""
+        stats = {}
+        for name, config in UPSTREAMS.items():
+            entry = {
+                "requests": self.request_counts[name],
+                "max_connections": config["max_connections"],
+                "open": False,
+            }
+            client = self.clients.get(name)
+            if client is not None and not client.is_closed:
+                entry["open"] = True
+                # httpcore keeps the live connections on the transport's pool
+                pool = getattr(getattr(client, "_transport", None), "_pool", None)
+                connections = list(getattr(pool, "connections", []) or [])
+                entry["connections"] = len(connections)
+                entry["idle"] = sum(1 for conn in connections if conn.is_idle())
+                entry["active"] = entry["connections"] - entry["idle"]
+            stats[name] = entry
+        return stats
+
+http_clients = HTTPClientManager()
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+class Stage:
+    """One pipeline stage: a bounded input queue drained by `workers` tasks.
+
+    A handler returning None ends the item's trip through the pipeline.
+    Because every queue is bounded, a slow stage blocks the `put` of the stage
+    before it, so backpressure reaches the fetchers instead of piling up
+    batches in memory.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]], workers: int = 1, queue_size: int = 4):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+
+    async def put(self, item):
+        await self.queue.put(item)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def stats(self, wall_time: float) -> dict:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "errors": self.errors,
+            "throughput_per_s": round(self.processed / wall_time, 2) if wall_time else 0.0,
+            "busy_s": round(self.busy_time, 3),
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "queue_size": self.queue.maxsize,
+        }
+
+class IngestPipeline:
+    """Chain of bounded asyncio stages: each stage's output feeds the next"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self.results = []
+        self.wall_time = 0.0
+
+    async def _worker(self, stage: Stage, next_stage: Optional[Stage]):
+        while True:
+            item = await stage.queue.get()
+            started = time.perf_counter()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                stage.errors += 1
+                result = None
+                print(f"❌ Pipeline stage '{stage.name}' failed: {e}")
+            stage.busy_time += time.perf_counter() - started
+            stage.processed += 1
+
+            try:
+                if result is not None:
+                    if next_stage is not None:
+                        await next_stage.put(result)
+                    else:
+                        self.results.append(result)
+            finally:
+                stage.queue.task_done()
+
+    async def run(self, items: List[Any]) -> List[Any]:
+        """Push items through every stage and return the last stage's outputs"""
+        self.results = []
+        started = time.perf_counter()
+
+        workers = []
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            workers.extend(
+                asyncio.create_task(self._worker(stage, next_stage))
+                for _ in range(stage.workers)
+            )
+
+        try:
+            for item in items:
+                await self.stages[0].put(item)
+            # Stages drain in order: once a stage's queue is joined nothing
+            # more can arrive at the next one except from its own workers
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.wall_time = time.perf_counter() - started
+
+        return self.results
+
+    def stats(self) -> dict:
+        return {stage.name: stage.stats(self.wall_time) for stage in self.stages}
@@ -248,30 +248,60 @@
 # news_fetcher = NewsFetcher()
 
 
-import httpx
-import asyncio
+import time
 from app.config import settings
 from app.database import get_database
-from datetime import datetime, timedelta
+from app.services.http_client import http_clients
+from app.services.dedup import near_duplicate_index
+from app.services.ingest_pipeline import IngestPipeline, Stage
+from app.services.count_cache import count_cache
+from app.services.response_cache import response_cache
+from app.services.home_feeds import home_feeds
+from app.utils.rate_limiter import TokenBucket
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta, timezone
 from typing import List
 
 class NewsFetcher:
     def __init__(self):
         self.api_key = settings.news_api_key
         self.base_url = "https://newsapi.org/v2"
+        self.categories = ["general", "technology", "business", "sports", "entertainment", "health", "science"]
+        
+        # Fetch workers + token bucket replace the fixed sleep between calls
+        self.rate_limiter = TokenBucket(settings.newsapi_rate_per_second, settings.newsapi_burst)
+        self.call_latencies = {}
+        self.last_run_stats = None
+        
+        # Per-feed watermarks ("category/language" -> newest publishedAt + validators)
+        self.watermarks = {}
+        self.pending_validators = {}
+        
+        # Async callables run on every stored batch (dict with category, language, docs, saved)
+        self.post_ingest_hooks = []
+        self.ingest_progress = {"running": False, "feeds": 0, "completed": 0}
         
     async def fetch_news(self, category: str = "general", language: str = "en") -> List[dict]:
-        """Fetch news - FIXED for real Hindi content"""
+        """Fetch news newer than the feed's watermark - FIXED for real Hindi content"""
+        key = f"{category}/{language}"
         try:
+            watermark = await self.get_watermark(category, language)
+            newest_seen = watermark.get("newestPublishedAt")
+            
             if language == "hi":
                 # For REAL Hindi news - use specific Hindi sources
                 hindi_sources = "the-times-of-india"  # They have Hindi content
                 
                 # Use 'everything' endpoint for better Hindi results
                 from datetime import datetime, timedelta
-                yesterday = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+                since = datetime.utcnow() - timedelta(days=1)
+                # Only ask for items newer than the last one we stored
+                if newest_seen and newest_seen > since:
+                    since = newest_seen
+                from_param = since.strftime('%Y-%m-%dT%H:%M:%S')
                 
-                url = f"{self.base_url}/everything?q=भारत OR india&language=hi&from={yesterday}&sortBy=publishedAt&apiKey={self.api_key}"
+                url = f"{self.base_url}/everything?q=भारत OR india&language=hi&from={from_param}&sortBy=publishedAt&apiKey={self.api_key}"
                 
                 if category != "general":
                     # Add category keyword in Hindi and English
@@ -284,167 +314,425 @@ class NewsFetcher:
                         "science": "science OR विज्ञान"
                     }
                     keyword = category_map.get(category, category)
-                    url = f"{self.base_url}/everything?q={keyword}&language=hi&from={yesterday}&sortBy=publishedAt&apiKey={self.api_key}"
+                    url = f"{self.base_url}/everything?q={keyword}&language=hi&from={from_param}&sortBy=publishedAt&apiKey={self.api_key}"
             else:
                 # English news - standard approach
                 url = f"{self.base_url}/top-headlines?category={category}&language={language}&apiKey={self.api_key}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=30.0)
+            # Conditional request - a 304 costs no payload
+            headers = {}
+            if watermark.get("etag"):
+                headers["If-None-Match"] = watermark["etag"]
+            if watermark.get("lastModified"):
+                headers["If-Modified-Since"] = watermark["lastModified"]
+            
+            client = http_clients.get("newsapi")
+            response = await client.get(url, headers=headers)
+            
+            if response.status_code == 304:
+                print(f"⏸️ Not modified: {category}/{language}")
+                return []
+            
+            if response.status_code == 200:
+                validators = {}
+                if response.headers.get("ETag"):
+                    validators["etag"] = response.headers["ETag"]
+                if response.headers.get("Last-Modified"):
+                    validators["lastModified"] = response.headers["Last-Modified"]
+                self.pending_validators[key] = validators
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    articles = data.get("articles", [])
-                    # Filter out articles with missing essential data
-                    filtered = [a for a in articles if a.get("title") and a.get("description")]
-                    print(f"✅ Fetched {len(filtered)} articles for {category}/{language}")
-                    return filtered
-                else:
-                    print(f"❌ Error: {response.status_code} - {response.text}")
-                    return []
+                data = response.json()
+                articles = data.get("articles", [])
+                # Filter out articles with missing essential data
+                filtered = [a for a in articles if a.get("title") and a.get("description")]
+                if newest_seen and language == "hi":
+                    # `everything` is sorted by publishedAt, so stop at the first known item.
+                    # top-headlines isn't - older stories can climb into it later - so those
+                    # are left to the unique url index instead.
+                    filtered = self._newer_than(filtered, newest_seen, stop_early=True)
+                print(f"✅ Fetched {len(filtered)} new articles for {category}/{language}")
+                return filtered
+            else:
+                print(f"❌ Error: {response.status_code} - {response.text}")
+                return []
         except Exception as e:
             print(f"❌ Error in fetch_news: {e}")
             return []
     
-    async def save_to_database(self, articles: List[dict], category: str, language: str):
-        """Save articles - FIXED to prevent empty cards"""
+    def _published_at(self, article: dict):
+        """publishedAt as naive UTC (how Mongo hands datetimes back), or None"""
+        value = article.get("publishedAt")
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    
+    def _newer_than(self, articles: List[dict], watermark: datetime, stop_early: bool = False) -> List[dict]:
+        """Keep articles published after the watermark"""
+        newer = []
+        for article in articles:
+            published = self._published_at(article)
+            if published is None or published > watermark:
+                newer.append(article)
+            elif stop_early:
+                break
+        return newer
+    
+    async def reload_leader_state(self):
+        """Catch up with what the previous leader stored - run on becoming leader.
+        
+        Followers never ingest, so their cached watermarks and near-duplicate
+        index stop at whatever they saw when they started.
+        """
+        self.watermarks = {}
+        self.pending_validators = {}
+        await near_duplicate_index.load(days=settings.article_retention_days)
+    
+    async def get_watermark(self, category: str, language: str) -> dict:
+        """Watermark for a feed, loaded from Mongo once per process"""
+        key = f"{category}/{language}"
+        if key not in self.watermarks:
+            db = get_database()
+            doc = await db["feed_watermarks"].find_one({"_id": key})
+            self.watermarks[key] = doc or {}
+        return self.watermarks[key]
+    
+    async def commit_watermark(self, category: str, language: str, articles: List[dict]):
+        """Advance a feed's watermark once its articles are stored"""
+        key = f"{category}/{language}"
+        current = self.watermarks.get(key, {})
+        update = self.pending_validators.pop(key, {})
+        
+        newest = max(filter(None, (self._published_at(a) for a in articles)), default=None)
+        if newest and (not current.get("newestPublishedAt") or newest > current["newestPublishedAt"]):
+            update["newestPublishedAt"] = newest
+        
+        if not update:
+            return
+        
+        update["updatedAt"] = datetime.utcnow()
+        db = get_database()
+        await db["feed_watermarks"].update_one({"_id": key}, {"$set": update}, upsert=True)
+        self.watermarks[key] = {**current, **update}
+    
+    def build_news_doc(self, article: dict, category: str, language: str) -> dict:
+        """Normalize a NewsAPI article into a `news` document"""
+        now = datetime.utcnow()
+        return {
+            "title": article.get("title"),
+            "description": article.get("description") or "No description available",
+            "content": article.get("content") or article.get("description"),
+            "url": article.get("url"),
+            "urlToImage": article.get("urlToImage"),
+            "publishedAt": datetime.fromisoformat(
+                article.get("publishedAt", now.isoformat()).replace("Z", "+00:00")
+            ),
+            "source": {
+                "id": article.get("source", {}).get("id"),
+                "name": article.get("source", {}).get("name", "Unknown")
+            },
+            "language": language,
+            # Text index language (our "hi" isn't a Mongo text language)
+            "searchLanguage": "english" if language == "en" else "none",
+            "category": category,
+            "aiSummary": None,
+            "audioSummaryUrl": None,
+            "createdAt": now,
+            "updatedAt": now
+        }
+    
+    async def bulk_upsert(self, docs: List[dict]) -> dict:
+        """Insert docs in one unordered bulk_write keyed on the unique `url` index.
+        
+        Returns exact counts: `inserted` new documents and `duplicates` that
+        already existed (or lost a concurrent insert race on the same url).
+        """
+        if not docs:
+            return {"inserted": 0, "duplicates": 0}
+        
         db = get_database()
         collection = db["news"]
         
-        saved_count = 0
+        operations = [
+            UpdateOne({"url": doc["url"]}, {"$setOnInsert": doc}, upsert=True)
+            for doc in docs
+        ]
+        
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            return {"inserted": result.upserted_count, "duplicates": result.matched_count}
+        except BulkWriteError as e:
+            # Concurrent upserts on the same url raise E11000 - those are duplicates too
+            details = e.details
+            write_errors = details.get("writeErrors", [])
+            key_errors = [err for err in write_errors if err.get("code") == 11000]
+            if len(key_errors) < len(write_errors):
+                print(f"⚠️ Bulk write errors: {[err for err in write_errors if err.get('code') != 11000][:3]}")
+            return {
+                "inserted": details.get("nUpserted", 0),
+                "duplicates": details.get("nMatched", 0) + len(key_errors)
+            }
+    
+    def normalize_articles(self, articles: List[dict], category: str, language: str):
+        """Validate raw articles and build documents. Returns (docs, in-batch url duplicates)"""
+        docs = []
+        seen_urls = set()
+        duplicates = 0
+        
         for article in articles:
             try:
                 # STRICT validation - no empty cards
-                if not article.get("title") or not article.get("description"):
+                if not article.get("title") or not article.get("description") or not article.get("url"):
                     continue
                 
-                # Check if already exists
-                existing = await collection.find_one({"url": article.get("url")})
-                if existing:
+                # Same url twice in one batch counts as a duplicate
+                if article["url"] in seen_urls:
+                    duplicates += 1
                     continue
+                seen_urls.add(article["url"])
                 
-                news_doc = {
-                    "title": article.get("title"),
-                    "description": article.get("description") or "No description available",
-                    "content": article.get("content") or article.get("description"),
-                    "url": article.get("url"),
-                    "urlToImage": article.get("urlToImage"),
-                    "publishedAt": datetime.fromisoformat(
-                        article.get("publishedAt", datetime.utcnow().isoformat()).replace("Z", "+00:00")
-                    ),
-                    "source": {
-                        "id": article.get("source", {}).get("id"),
-                        "name": article.get("source", {}).get("name", "Unknown")
-                    },
-                    "language": language,
-                    "category": category,
-                    "aiSummary": None,
-                    "audioSummaryUrl": None,
-                    "createdAt": datetime.utcnow(),
-                    "updatedAt": datetime.utcnow()
-                }
-                
-                await collection.insert_one(news_doc)
-                saved_count += 1
+                docs.append(self.build_news_doc(article, category, language))
                         
             except Exception as e:
                 print(f"Error saving article: {e}")
                 continue
         
-        print(f"💾 Saved {saved_count} new articles for {category}/{language}")
-        return saved_count
+        return docs, duplicates
     
-    async def fetch_and_store_all_categories(self):
-        """Optimized for free tier - Real Hindi + English"""
+    def dedupe_docs(self, docs: List[dict]):
+        """Drop near-duplicate stories or link them to their cluster.
         
-        total_saved = 0
+        Returns (docs, near-duplicates, urls newly added to the near-duplicate index)
+        """
+        kept = []
+        near_duplicates = 0
+        indexed = []
         
-        # English news - ALL 7 categories (7 API calls)
-        print("📰 Fetching English news...")
-        en_categories = ["general", "technology", "business", "sports", "entertainment", "health", "science"]
+        for doc in docs:
+            # Same story from another source/category - drop it or link it to its cluster
+            match = near_duplicate_index.check(doc["url"], doc.get("title"), doc.get("description"))
+            if match["indexed"]:
+                indexed.append(doc["url"])
+            if match["duplicate"] and settings.near_duplicate_action == "drop":
+                near_duplicates += 1
+                continue
+            doc["clusterId"] = match["clusterId"]
+            kept.append(doc)
         
-        for category in en_categories:
-            articles = await self.fetch_news(category, "en")
-            saved = await self.save_to_database(articles, category, "en")
-            total_saved += saved
-            await asyncio.sleep(2)
+        return kept, near_duplicates, indexed
+    
+    async def store_docs(self, docs: List[dict], indexed: List[str]) -> dict:
+        """Bulk upsert docs, un-indexing the batch's urls from the near-duplicate index on failure.
         
-        # Hindi news - ALL 7 categories (7 API calls)
-        print("📰 Fetching REAL Hindi news...")
-        hi_categories = ["general", "technology", "business", "sports", "entertainment", "health", "science"]
+        `indexed` covers the dropped near-duplicates too - left behind, they would
+        match the batch's own stories when a retry re-fetches them.
+        """
+        try:
+            counts = await self.bulk_upsert(docs)
+        except Exception:
+            for url in indexed:
+                near_duplicate_index.forget(url)
+            raise
         
-        for category in hi_categories:
-            articles = await self.fetch_news(category, "hi")
-            saved = await self.save_to_database(articles, category, "hi")
-            total_saved += saved
-            await asyncio.sleep(2)
+        if counts["inserted"]:
+            self.data_changed()
+        return counts
+    
+    def data_changed(self):
+        """Drop everything derived from the `news` collection after ingest or cleanup"""
+        count_cache.invalidate()
+        response_cache.invalidate()
+        home_feeds.schedule_refresh()
+    
+    async def save_to_database(self, articles: List[dict], category: str, language: str):
+        """Save articles with a single bulk upsert - no empty cards, no duplicates"""
+        docs, duplicates = self.normalize_articles(articles, category, language)
+        docs, near_duplicates, indexed = self.dedupe_docs(docs)
         
-        print(f"✅ Total: {total_saved} articles (14 API calls used)")
+        try:
+            counts = await self.store_docs(docs, indexed)
+        except Exception as e:
+            print(f"❌ Bulk save error for {category}/{language}: {e}")
+            return 0
         
-        # ✅ CRITICAL: Send notification if new articles were saved
-        if total_saved > 0:
+        saved_count = counts["inserted"]
+        duplicates += counts["duplicates"]
+        print(
+            f"💾 Saved {saved_count} new articles for {category}/{language} "
+            f"({duplicates} duplicates, {near_duplicates} near-duplicates)"
+        )
+        return saved_count
+    
+    # ===== Ingest pipeline stages: fetch -> normalize -> dedupe -> store -> hooks =====
+    
+    async def _fetch_stage(self, feed: tuple) -> dict:
+        category, language = feed
+        await self.rate_limiter.acquire()
+        started = time.perf_counter()
+        articles = await self.fetch_news(category, language)
+        self.call_latencies[f"{category}/{language}"] = time.perf_counter() - started
+        return {"category": category, "language": language, "articles": articles}
+    
+    async def _normalize_stage(self, batch: dict) -> dict:
+        batch["docs"], batch["duplicates"] = self.normalize_articles(
+            batch["articles"], batch["category"], batch["language"]
+        )
+        return batch
+    
+    async def _dedupe_stage(self, batch: dict) -> dict:
+        batch["docs"], batch["near_duplicates"], batch["indexed"] = self.dedupe_docs(batch["docs"])
+        return batch
+    
+    async def _store_stage(self, batch: dict) -> dict:
+        counts = await self.store_docs(batch["docs"], batch["indexed"])
+        batch["saved"] = counts["inserted"]
+        batch["duplicates"] += counts["duplicates"]
+        # Only advance the watermark once the batch is safely stored
+        await self.commit_watermark(batch["category"], batch["language"], batch["articles"])
+        print(
+            f"💾 Saved {batch['saved']} new articles for {batch['category']}/{batch['language']} "
+            f"({batch['duplicates']} duplicates, {batch['near_duplicates']} near-duplicates)"
+        )
+        return batch
+    
+    async def _hooks_stage(self, batch: dict) -> dict:
+        for hook in self.post_ingest_hooks:
             try:
-                # Import here to avoid circular dependency
-                from firebase_admin import messaging
-                
-                # Get all subscriber tokens
-                db = get_database()
-                collection = db["notification_tokens"]
-                cursor = collection.find({})
-                tokens = []
-                async for doc in cursor:
-                    if doc.get("token"):
-                        tokens.append(doc["token"])
-                
-                if tokens:
-                    print(f"📬 Sending notification to {len(tokens)} subscribers...")
-                    
-                    # Send to each token individually (compatible with all versions)
-                    success_count = 0
-                    failure_count = 0
-                    invalid_tokens = []
-                    
-                    for idx, token in enumerate(tokens):
-                        try:
-                            message = messaging.Message(
-                                notification=messaging.Notification(
-                                    title=f"📰 {total_saved} New Articles!",
-                                    body="Fresh news just arrived. Check out the latest updates!"
-                                ),
-                                token=token
-                            )
-                            messaging.send(message)
-                            success_count += 1
-                        except Exception as e:
-                            failure_count += 1
-                            invalid_tokens.append(token)
-                            print(f"❌ Failed to send to token {idx+1}: {e}")
-                    
-                    print(f"✅ Sent: {success_count} | Failed: {failure_count}")
-                    
-                    # Remove invalid tokens
-                    if invalid_tokens:
-                        await collection.delete_many({"token": {"$in": invalid_tokens}})
-                        print(f"🗑️ Removed {len(invalid_tokens)} invalid tokens")
-                else:
-                    print("⚠️ No subscribers found - skipping notification")
-                    
+                await hook(batch)
             except Exception as e:
-                print(f"⚠️ Notification error: {e}")
-                import traceback
-                traceback.print_exc()
+                print(f"⚠️ Post-ingest hook {getattr(hook, '__name__', hook)} failed: {e}")
+        self.ingest_progress["completed"] += 1
+        return batch
+    
+    def build_pipeline(self) -> IngestPipeline:
+        """Bounded stages, each with its own worker count and queue size"""
+        queue_size = settings.pipeline_queue_size
+        return IngestPipeline([
+            Stage("fetch", self._fetch_stage, settings.fetch_concurrency, queue_size),
+            Stage("normalize", self._normalize_stage, settings.pipeline_normalize_workers, queue_size),
+            Stage("dedupe", self._dedupe_stage, 1, queue_size),
+            Stage("store", self._store_stage, settings.pipeline_store_workers, queue_size),
+            Stage("hooks", self._hooks_stage, settings.pipeline_hook_workers, queue_size),
+        ])
+    
+    def all_feeds(self) -> List[tuple]:
+        """Every (category, language) pair - 7 English + 7 Hindi categories"""
+        return [(category, language) for language in ["en", "hi"] for category in self.categories]
+    
+    async def fetch_and_store_all_categories(self, feeds: List[tuple] = None):
+        """Run every category/language feed (or just `feeds`) through the ingest pipeline"""
+        
+        # One API call per feed - 14 when refreshing everything
+        if feeds is None:
+            feeds = self.all_feeds()
+        
+        self.call_latencies = {}
+        print(f"📰 Fetching {len(feeds)} feeds (concurrency={settings.fetch_concurrency})...")
+        
+        pipeline = self.build_pipeline()
+        self.ingest_progress = {"running": True, "feeds": len(feeds), "completed": 0}
+        try:
+            batches = await pipeline.run(feeds)
+        finally:
+            self.ingest_progress["running"] = False
+        total_saved = sum(batch["saved"] for batch in batches)
+        
+        latencies = list(self.call_latencies.values())
+        self.last_run_stats = {
+            "feeds": len(feeds),
+            "stored_feeds": len(batches),
+            "saved": total_saved,
+            "wall_time": round(pipeline.wall_time, 3),
+            "latency_avg": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "latency_max": round(max(latencies), 3) if latencies else 0.0,
+            "latencies": {key: round(value, 3) for key, value in self.call_latencies.items()},
+            "stages": pipeline.stats(),
+            "finishedAt": datetime.utcnow()
+        }
+        
+        print(f"✅ Total: {total_saved} articles ({len(feeds)} API calls used)")
+        print(
+            f"⏱️ Wall time: {pipeline.wall_time:.2f}s | "
+            f"API latency avg {self.last_run_stats['latency_avg']:.2f}s, "
+            f"max {self.last_run_stats['latency_max']:.2f}s"
+        )
+        
+        # ✅ CRITICAL: Send notification if new articles were saved
+        # (once per run, not per batch, so subscribers get a single push)
+        if total_saved > 0:
+            await self.notify_subscribers(total_saved)
         
         return total_saved
     
+    async def notify_subscribers(self, total_saved: int):
+        """Push a "new articles" notification to every subscribed token"""
+        try:
+            # Import here to avoid circular dependency
+            from firebase_admin import messaging
+            
+            # Get all subscriber tokens
+            db = get_database()
+            collection = db["notification_tokens"]
+            cursor = collection.find({})
+            tokens = []
+            async for doc in cursor:
+                if doc.get("token"):
+                    tokens.append(doc["token"])
+            
+            if tokens:
+                print(f"📬 Sending notification to {len(tokens)} subscribers...")
+                
+                # Send to each token individually (compatible with all versions)
+                success_count = 0
+                failure_count = 0
+                invalid_tokens = []
+                
+                for idx, token in enumerate(tokens):
+                    try:
+                        message = messaging.Message(
+                            notification=messaging.Notification(
+                                title=f"📰 {total_saved} New Articles!",
+                                body="Fresh news just arrived. Check out the latest updates!"
+                            ),
+                            token=token
+                        )
+                        messaging.send(message)
+                        success_count += 1
+                    except Exception as e:
+                        failure_count += 1
+                        invalid_tokens.append(token)
+                        print(f"❌ Failed to send to token {idx+1}: {e}")
+                
+                print(f"✅ Sent: {success_count} | Failed: {failure_count}")
+                
+                # Remove invalid tokens
+                if invalid_tokens:
+                    await collection.delete_many({"token": {"$in": invalid_tokens}})
+                    print(f"🗑️ Removed {len(invalid_tokens)} invalid tokens")
+            else:
+                print("⚠️ No subscribers found - skipping notification")
+                
+        except Exception as e:
+            print(f"⚠️ Notification error: {e}")
+            import traceback
+            traceback.print_exc()
+    
     async def cleanup_old_articles(self):
-        """Delete articles older than 7 days"""
-        db = get_database()
-        collection = db["news"]
-        
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        result = await collection.delete_many({"createdAt": {"$lt": seven_days_ago}})
+        """Daily maintenance - article expiry itself is handled by the createdAt TTL index.
         
-        print(f"🗑️ Deleted {result.deleted_count} old articles")
-        return result.deleted_count
+        Prunes the in-memory near-duplicate index to the same retention window.
+        Orphaned audio is collected separately, in every process (see audio_gc).
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.article_retention_days)
+        pruned = near_duplicate_index.prune(cutoff)
+        # The TTL monitor deletes expired articles on its own schedule
+        self.data_changed()
+        print(f"🗑️ Pruned {pruned} expired articles from the near-duplicate index")
+        return pruned
 
 news_fetcher = NewsFetcher()
\ No newline at end of file
@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict, namedtuple
+from typing import Awaitable, Callable
+import orjson
+from bson import ObjectId
+from app.config import settings
+
+def _encode_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def render_json(payload) -> bytes:
+    """Encode a payload straight to JSON bytes with orjson.
+
+    datetimes are written natively and ObjectIds as strings, giving the same
+    compact UTF-8 output as FastAPI's JSONResponse without jsonable_encoder's
+    per-value walk.
+    """
+    return orjson.dumps(payload, default=_encode_default)
+
+# A cached response body and its strong ETag (hash of the body)
+CachedResponse = namedtuple("CachedResponse", ["body", "etag"])
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def cache_key(route: str, **params) -> str:
+    """Route name plus the parsed query params, sorted, with unset ones dropped"""
+    parts = [f"{name}={value}" for name, value in sorted(params.items()) if value not in (None, "")]
+    return f"{route}?{'&'.join(parts)}"
+
+class ResponseCache:
+    """LRU + TTL cache of pre-serialised JSON response bodies and their ETags.
+
+    Bounded by total body bytes. Concurrent misses on the same key wait on
+    one computation instead of all querying Mongo. A body computed across an
+    `invalidate()` is served but not cached, since it may predate the change.
+    ETags are hashes of the body, so every worker serving the same data hands
+    out the same tag.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (CachedResponse, expires_at)
+        self.size = 0
+        self.locks = {}
+        self.waiters = {}  # key -> callers holding or queued on its lock
+        self.generation = 0  # bumped by invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        cached, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self.entries.move_to_end(key)
+        return cached
+
+    def set(self, key: str, body: bytes) -> CachedResponse:
+        cached = CachedResponse(body, make_etag(body))
+        if len(body) > self.max_bytes:
+            return cached
+        self.delete(key)
+        self.entries[key] = (cached, time.monotonic() + self.ttl)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.evictions += 1
+        return cached
+
+    def delete(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0].body)
+
+    async def get_or_set(self, key: str, producer: Callable[[], Awaitable[bytes]]) -> CachedResponse:
+        """Cached response for `key`, computing the body once with `producer` on a miss"""
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                # Another request may have filled it while we waited
+                cached = self.get(key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+                generation = self.generation
+                body = await producer()
+                if generation != self.generation:
+                    # Invalidated mid-computation - the body may hold pre-ingest data
+                    return CachedResponse(body, make_etag(body))
+                return self.set(key, body)
+        finally:
+            # Keep the lock while anyone is still queued on it, or a new caller would get a fresh one
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+                del self.locks[key]
+
+    def invalidate(self, prefix: str = None):
+        """Drop every entry, or only keys starting with `prefix`"""
+        self.generation += 1
+        if prefix is None:
+            self.entries.clear()
+            self.size = 0
+            return
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            self.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+response_cache = ResponseCache(settings.response_cache_max_bytes, settings.response_cache_ttl_seconds)
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database import get_database
+from app.utils.leader import leader_lease, renew_lease
+
+class SummaryFlight:
+    """Single-flight summary generation per article.
+
+    Concurrent requests in this process share one future. Across workers a
+    short Mongo lease (summary_leases, expired by a TTL index) elects the
+    generator; the others poll until its result is stored or the lease goes
+    away, then take over if nothing was stored.
+    """
+
+    def __init__(self):
+        self.lease_seconds = settings.summary_lease_seconds
+        self.poll_seconds = settings.summary_poll_seconds
+        self.inflight = {}  # article id -> asyncio.Future
+        self.generated = 0
+        self.joined = 0
+        self.remote_waits = 0
+
+    async def run(self, article_id: str, generate: Callable[[], Awaitable[dict]],
+                  stored: Callable[[], Awaitable[Optional[dict]]]) -> dict:
+        """Result of `generate()`, run at most once at a time per article.
+
+        `stored()` returns the already saved result (or None); it is checked
+        while another worker holds the lease.
+        """
+        future = self.inflight.get(article_id)
+        if future is not None:
+            self.joined += 1
+            # shield: a cancelled follower must not cancel the shared generation
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[article_id] = future
+        try:
+            result = await self._run_leased(article_id, generate, stored)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers get the error; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            self.inflight.pop(article_id, None)
+
+    async def _run_leased(self, article_id: str, generate, stored) -> dict:
+        collection = get_database()["summary_leases"]
+        while True:
+            if await self._acquire(collection, article_id):
+                # Generation can outlast the lease (page fetch, Gemini retries, TTS) - keep it alive
+                holder = {"_id": article_id, "holder": leader_lease.instance_id}
+                renewal = asyncio.create_task(renew_lease(collection, holder, "expiresAt", self.lease_seconds))
+                try:
+                    # The previous holder may have stored it just before releasing
+                    result = await stored()
+                    if result is not None:
+                        return result
+                    self.generated += 1
+                    return await generate()
+                finally:
+                    renewal.cancel()
+                    await collection.delete_one(holder)
+
+            # Another worker is generating - wait for its result or for the lease to go
+            self.remote_waits += 1
+            while True:
+                await asyncio.sleep(self.poll_seconds)
+                result = await stored()
+                if result is not None:
+                    return result
+                lease = await collection.find_one({"_id": article_id})
+                if lease is None or lease["expiresAt"] < datetime.utcnow():
+                    break
+
+    async def _acquire(self, collection, article_id: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            await collection.update_one(
+                {"_id": article_id, "expiresAt": {"$lt": now}},
+                {"$set": {
+                    "holder": leader_lease.instance_id,
+                    "expiresAt": now + timedelta(seconds=self.lease_seconds)
+                }},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # A live lease exists
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self.inflight),
+            "generated": self.generated,
+            "joined": self.joined,
+            "remote_waits": self.remote_waits,
+        }
+
+summary_flight = SummaryFlight()
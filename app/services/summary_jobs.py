@@ -0,0 +1,229 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database import get_database
+from app.services.ai_summarizer import ai_summarizer
+from app.services.response_cache import response_cache, cache_key
+from app.services.summary_flight import summary_flight
+from app.utils.leader import leader_lease, renew_lease
+
+# Job priorities - higher runs first
+PRIORITY_REQUEST = 10
+PRIORITY_INGEST = 0
+
+def has_summary_text(doc) -> bool:
+    """Whether an article doc has a usable stored summary (with or without audio)"""
+    return bool(doc and doc.get("aiSummary") and len(doc.get("aiSummary", "")) > 100)
+
+def stored_summary(doc) -> Optional[dict]:
+    """The saved summary response for an article doc, if it has a full one.
+
+    A summary without audio doesn't count - its audio was shed (TTS queue full
+    or timed out) and has to be generated again.
+    """
+    if has_summary_text(doc) and doc.get("audioSummaryUrl"):
+        return {
+            "summary": doc["aiSummary"],
+            "audioUrl": doc.get("audioSummaryUrl"),
+            "cached": True
+        }
+    return None
+
+class SummaryJobs:
+    """Mongo-backed summary job queue worked by a bounded pool of tasks.
+
+    Jobs live in `summary_jobs` with a priority; workers in every process
+    claim the highest-priority queued job atomically with
+    find_one_and_update, so the pool scales out with the app. An article
+    has at most one active (queued/running) job, enforced by a partial
+    unique index, and a job whose worker died is reclaimed once its lock
+    expires.
+    """
+
+    def __init__(self):
+        self.worker_count = settings.summary_workers
+        self.lock_seconds = settings.summary_lease_seconds
+        self.max_attempts = settings.summary_job_max_attempts
+        self.poll_seconds = settings.summary_job_poll_seconds
+        self.presummarize_per_batch = settings.summary_presummarize_per_batch
+        self.workers = []
+        self.wakeup = asyncio.Event()
+        self.completed = 0
+        self.failed = 0
+
+    async def summarize(self, doc: dict) -> dict:
+        """Stored summary for an article doc, or generate one (single-flight)"""
+        cached = stored_summary(doc)
+        if cached:
+            return cached
+
+        collection = get_database()["news"]
+
+        async def reload():
+            return stored_summary(await collection.find_one({"_id": doc["_id"]}, {"aiSummary": 1, "audioSummaryUrl": 1}))
+
+        # Concurrent requests for the same article (in any worker) share one generation
+        return await summary_flight.run(str(doc["_id"]), lambda: self._generate(collection, doc), reload)
+
+    async def _generate(self, collection, doc: dict) -> dict:
+        title = doc.get("title", "")
+        description = doc.get("description", "")
+        content = doc.get("content", "")
+        url = doc.get("url", "")
+        language = doc.get("language", "en")
+
+        # The summary may already be stored with its audio missing - then only the audio is redone
+        current = await collection.find_one({"_id": doc["_id"]}, {"aiSummary": 1})
+        if has_summary_text(current):
+            summary = current["aiSummary"]
+            print(f"Regenerating audio for: {title[:50]}...")
+        else:
+            print(f"Generating summary for: {title[:50]}...")
+
+            summary = await ai_summarizer.generate_summary(
+                title=title,
+                description=description,
+                content=content,
+                url=url,
+                language=language
+            )
+
+            print(f"Summary generated: {len(summary)} chars")
+
+        audio_url = await ai_summarizer.generate_audio_summary(summary, language)
+
+        update = {"aiSummary": summary, "updatedAt": datetime.utcnow()}
+        # No audio (TTS queue full or timed out) leaves the field unset so a later request retries it
+        if audio_url:
+            update["audioSummaryUrl"] = audio_url
+        await collection.update_one({"_id": doc["_id"]}, {"$set": update})
+        # invalidate, not delete, so an article response being computed right now isn't cached
+        response_cache.invalidate(cache_key(f"article/{doc['_id']}"))
+
+        return {"summary": summary, "audioUrl": audio_url, "cached": False}
+
+    async def enqueue(self, article_id: str, priority: int = PRIORITY_REQUEST) -> dict:
+        """Queue a summary job, or return the article's active one (raising its priority)"""
+        collection = get_database()["summary_jobs"]
+        now = datetime.utcnow()
+        for _ in range(2):
+            try:
+                job = await collection.find_one_and_update(
+                    {"articleId": article_id, "active": True},
+                    {
+                        "$max": {"priority": priority},
+                        "$setOnInsert": {"status": "queued", "attempts": 0, "createdAt": now}
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                self.wakeup.set()
+                return job
+            except DuplicateKeyError:
+                # Lost an insert race with another request - the next pass finds its job
+                continue
+        return await collection.find_one({"articleId": article_id, "active": True})
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        return await get_database()["summary_jobs"].find_one({"_id": ObjectId(job_id)})
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await get_database()["summary_jobs"].find_one_and_update(
+            {
+                "active": True,
+                "$or": [{"status": "queued"}, {"status": "running", "lockedUntil": {"$lt": now}}]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lockedBy": leader_lease.instance_id,
+                    "lockedUntil": now + timedelta(seconds=self.lock_seconds),
+                    "startedAt": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("priority", -1), ("createdAt", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _run_job(self, job: dict):
+        collection = get_database()["summary_jobs"]
+        # Keep the lock ahead of a long generation so _claim doesn't hand the job out again
+        owned = {"_id": job["_id"], "lockedBy": leader_lease.instance_id}
+        renewal = asyncio.create_task(renew_lease(collection, owned, "lockedUntil", self.lock_seconds))
+        try:
+            doc = await get_database()["news"].find_one({"_id": ObjectId(job["articleId"])})
+            if not doc:
+                raise LookupError("Article not found")
+            result = await self.summarize(doc)
+            update = {
+                "$set": {"status": "done", "result": result, "finishedAt": datetime.utcnow()},
+                "$unset": {"active": "", "lockedUntil": ""}
+            }
+            self.completed += 1
+        except Exception as e:
+            print(f"⚠️ Summary job {job['_id']} failed (attempt {job['attempts']}): {e}")
+            if job["attempts"] < self.max_attempts and not isinstance(e, LookupError):
+                update = {"$set": {"status": "queued", "error": str(e)}, "$unset": {"lockedUntil": ""}}
+            else:
+                update = {
+                    "$set": {"status": "failed", "error": str(e), "finishedAt": datetime.utcnow()},
+                    "$unset": {"active": "", "lockedUntil": ""}
+                }
+                self.failed += 1
+        finally:
+            renewal.cancel()
+        await collection.update_one(owned, update)
+
+    async def _worker(self):
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"⚠️ Summary job claim failed: {e}")
+                job = None
+            if job is None:
+                # Local enqueues wake us straight away; other processes' are picked up by polling
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_job(job)
+
+    def start(self):
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        print(f"🧠 Summary workers started ({self.worker_count})")
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def presummarize(self, batch: dict):
+        """Post-ingest hook: queue the newest new articles of a batch at low priority"""
+        if not batch.get("saved") or not self.presummarize_per_batch:
+            return
+        urls = [doc["url"] for doc in batch["docs"]]
+        # New docs store aiSummary: None - a None match covers null and missing
+        cursor = get_database()["news"].find(
+            {"url": {"$in": urls}, "aiSummary": None}, {"_id": 1}
+        ).sort("publishedAt", -1).limit(self.presummarize_per_batch)
+        async for doc in cursor:
+            await self.enqueue(str(doc["_id"]), PRIORITY_INGEST)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+summary_jobs = SummaryJobs()
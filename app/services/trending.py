@@ -0,0 +1,133 @@
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.config import settings
+from app.database import get_database
+from app.services.response_cache import response_cache
+
+class TrendingService:
+    """Popularity-based trending list, served from memory.
+
+    Views and summary requests are counted in memory and flushed to Mongo as
+    one unordered `$inc` bulk write per interval. Recomputation is
+    incremental: each pass only reads articles created or re-counted since
+    the previous pass (re-reading an overlap, since createdAt/popularityAt
+    are stamped before their writes commit), then re-scores the in-memory
+    candidate set. A periodic full rescan catches anything the overlap missed
+    and drops deleted articles.
+    """
+
+    def __init__(self):
+        self.window = timedelta(hours=settings.trending_window_hours)
+        self.gravity = settings.trending_gravity
+        self.size = settings.trending_size
+        self.pending = {}  # article id -> {"views": n, "summaryRequests": n}
+        self.candidates = {}  # ObjectId -> article doc
+        self.ranked = []
+        self.last_sync = None
+        self.last_full_sync = None
+        self.sync_overlap = timedelta(seconds=settings.trending_sync_overlap_seconds)
+        self.full_rescan_interval = timedelta(minutes=settings.trending_full_rescan_minutes)
+        self.flushed_events = 0
+        self.flushes = 0
+        self.recompute_ms = 0.0
+
+    def _record(self, article_id: str, counter: str):
+        if not ObjectId.is_valid(article_id):
+            return
+        counts = self.pending.setdefault(article_id, {"views": 0, "summaryRequests": 0})
+        counts[counter] += 1
+
+    def record_view(self, article_id: str):
+        self._record(article_id, "views")
+
+    def record_summary_request(self, article_id: str):
+        self._record(article_id, "summaryRequests")
+
+    async def flush(self):
+        """Write pending counters in one bulk $inc"""
+        if not self.pending:
+            return 0
+        pending, self.pending = self.pending, {}
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": ObjectId(article_id)},
+                {"$inc": {name: value for name, value in counts.items() if value}, "$set": {"popularityAt": now}}
+            )
+            for article_id, counts in pending.items()
+        ]
+        try:
+            await get_database()["news"].bulk_write(operations, ordered=False)
+        except Exception as e:
+            # Put the counts back so the next flush retries them
+            for article_id, counts in pending.items():
+                merged = self.pending.setdefault(article_id, {"views": 0, "summaryRequests": 0})
+                for name, value in counts.items():
+                    merged[name] += value
+            print(f"⚠️ View counter flush failed: {e}")
+            return 0
+        self.flushes += 1
+        self.flushed_events += sum(sum(counts.values()) for counts in pending.values())
+        return len(operations)
+
+    def score(self, doc: dict, now: datetime) -> float:
+        """(1 + views + 3 x summary requests) decayed by age in hours"""
+        published = doc.get("publishedAt") or doc.get("createdAt") or now
+        age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        popularity = 1 + doc.get("views", 0) + 3 * doc.get("summaryRequests", 0)
+        return popularity / (age_hours + 2) ** self.gravity
+
+    async def recompute(self):
+        """Pull changed articles into the candidate set and re-rank it"""
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        since = now - self.window
+        query = {
+            "publishedAt": {"$gte": since},
+            "title": {"$exists": True, "$ne": ""},
+            "description": {"$exists": True, "$ne": ""}
+        }
+        full = self.last_full_sync is None or now - self.last_full_sync >= self.full_rescan_interval
+        if not full:
+            # Only new articles and ones whose counters moved since the last pass. Both
+            # stamps are taken before the write lands (ingest stages, other workers'
+            # flushes), so re-read an overlap instead of trusting last_sync exactly.
+            changed_since = self.last_sync - self.sync_overlap
+            query["$or"] = [{"createdAt": {"$gte": changed_since}}, {"popularityAt": {"$gte": changed_since}}]
+
+        candidates = {} if full else self.candidates
+        async for doc in get_database()["news"].find(query):
+            candidates[doc["_id"]] = doc
+        self.candidates = candidates
+        self.last_sync = now
+        if full:
+            self.last_full_sync = now
+
+        for object_id in [oid for oid, doc in self.candidates.items() if (doc.get("publishedAt") or now) < since]:
+            del self.candidates[object_id]
+
+        self.ranked = sorted(self.candidates.values(), key=lambda doc: self.score(doc, now), reverse=True)[:self.size]
+        self.recompute_ms = (time.perf_counter() - started) * 1000
+        # Cached trending responses hold the previous ranking
+        response_cache.invalidate("trending")
+
+    @property
+    def ready(self) -> bool:
+        return self.last_sync is not None and bool(self.ranked)
+
+    def top(self, limit: int) -> list:
+        return self.ranked[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "candidates": len(self.candidates),
+            "pending_articles": len(self.pending),
+            "flushes": self.flushes,
+            "flushed_events": self.flushed_events,
+            "last_sync": self.last_sync,
+            "recompute_ms": round(self.recompute_ms, 2),
+        }
+
+trending_service = TrendingService()
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from app.config import settings
+
+class TTSQueueFull(Exception):
+    """Raised when the synthesis queue is at its depth limit"""
+
+class TTSPool:
+    """Bounded thread pool for blocking text-to-speech work.
+
+    gTTS makes blocking HTTP calls and writes files, so it runs here instead
+    of on the event loop. At most `workers` syntheses run at once and at
+    most `max_queue` more wait; beyond that calls fail fast with
+    TTSQueueFull. A timed-out call keeps its slot until the thread actually
+    finishes, so the bound stays honest.
+    """
+
+    def __init__(self):
+        self.workers = settings.tts_workers
+        self.max_queue = settings.tts_max_queue
+        self.timeout = settings.tts_timeout_seconds
+        self.executor = None
+        self.pending = 0  # running + queued, only touched on the event loop
+        self.latencies = deque(maxlen=200)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tts")
+        return self.executor
+
+    async def run(self, func: Callable, *args):
+        """Run a blocking synthesis call in the pool and await its result"""
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise TTSQueueFull(f"TTS queue full ({self.pending} pending)")
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        queued_at = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            return func(*args), started - queued_at, time.perf_counter() - started
+
+        future = loop.run_in_executor(self._executor(), task)
+        # The slot frees when the thread is done, even if the caller timed out
+        future.add_done_callback(lambda _: self._release())
+        try:
+            result, wait_time, run_time = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.latencies.append((wait_time, run_time))
+        return result
+
+    def _release(self):
+        self.pending -= 1
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self) -> dict:
+        runs = sorted(run for _, run in self.latencies)
+        waits = [wait for wait, _ in self.latencies]
+        # The pool runs pending work as soon as a thread is free
+        running = min(self.pending, self.workers)
+        return {
+            "workers": self.workers,
+            "running": running,
+            "queued": self.pending - running,
+            "saturation": round(running / self.workers, 2),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "run_ms_p50": round(runs[len(runs) // 2] * 1000, 1) if runs else None,
+            "run_ms_p95": round(runs[int(len(runs) * 0.95)] * 1000, 1) if runs else None,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else None,
+        }
+
+tts_pool = TTSPool()
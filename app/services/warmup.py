@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+from app.config import settings
+from app.database import create_indexes
+from app.services.dedup import near_duplicate_index
+from app.services.news_fetcher import news_fetcher
+from app.services.feed_schedule import feed_schedule
+from app.services.home_feeds import home_feeds
+from app.services.trending import trending_service
+from app.utils.leader import leader_lease
+
+class WarmUp:
+    """Startup work that runs in the background so the app serves immediately.
+
+    A failing step (e.g. Mongo not reachable yet) is retried with backoff
+    until it succeeds, so the process never runs on with an empty
+    near-duplicate index or without its first fetch.
+    """
+
+    def __init__(self):
+        self.state = "pending"  # pending -> running -> done | failed (cancelled)
+        self.step = None
+        self.attempts = 0
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        self.state = "running"
+        self.started_at = datetime.utcnow()
+        steps = [
+            ("indexes", create_indexes),
+            ("dedup_index", lambda: near_duplicate_index.load(days=settings.article_retention_days)),
+            ("home_feeds", home_feeds.refresh),
+            ("trending", trending_service.recompute),
+            ("initial_fetch", self.initial_fetch),
+        ]
+        try:
+            for name, step in steps:
+                self.step = name
+                await self.run_step(name, step)
+            self.state = "done"
+            self.error = None
+            print("✅ Warm-up complete")
+        except asyncio.CancelledError:
+            self.state = "failed"
+            self.error = "cancelled"
+            raise
+        finally:
+            self.finished_at = datetime.utcnow()
+
+    async def run_step(self, name: str, step):
+        """Run a step until it succeeds, doubling the wait between attempts"""
+        delay = settings.warmup_retry_seconds
+        self.attempts = 0
+        while True:
+            self.attempts += 1
+            print(f"🔥 Warm-up: {name}...")
+            try:
+                await step()
+                return
+            except Exception as e:
+                self.error = str(e) or type(e).__name__
+                print(f"❌ Warm-up failed at {name} (attempt {self.attempts}), retrying in {delay:g}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.warmup_retry_max_seconds)
+
+    async def initial_fetch(self):
+        """First fetch - only in the scheduler leader, so replicas don't all hit NewsAPI.
+        
+        Only feeds the adaptive schedule says are due, so restarts don't spend
+        the NewsAPI quota refetching everything.
+        """
+        if not await leader_lease.heartbeat():
+            print("⏭️ Skipping initial fetch - another process is the scheduler leader")
+            return
+        due = await feed_schedule.due_feeds(news_fetcher.all_feeds())
+        if not due:
+            print("⏭️ Skipping initial fetch - no feed is due yet")
+            return
+        await news_fetcher.fetch_and_store_all_categories(due)
+
+    async def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "step": self.step,
+            "attempts": self.attempts,
+            "error": self.error,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "ingest": news_fetcher.ingest_progress,
+        }
+
+warm_up = WarmUp()
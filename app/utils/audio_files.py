@@ -0,0 +1,32 @@
+import hashlib
+import os
+import unicodedata
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+# Audio files are named by their content, so a URL never changes meaning
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def audio_filename(text: str, language: str) -> str:
+    """Content address for the audio of `text`: hash of language + normalised text"""
+    normalised = " ".join(unicodedata.normalize("NFC", text).split())
+    digest = hashlib.blake2b(f"{language}\0{normalised}".encode("utf-8"), digest_size=16).hexdigest()
+    return f"{digest}.mp3"
+
+class AudioFiles(StaticFiles):
+    """Static audio with immutable caching.
+
+    The filename stem is used as a strong ETag (content-addressed files never
+    change; older uuid-named ones are never rewritten either), so it stays
+    stable when the GC or a reuse touches the file's mtime. Byte ranges and
+    If-Range come from Starlette's FileResponse.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200):
+        stem = os.path.splitext(os.path.basename(full_path))[0]
+        headers = {"Cache-Control": AUDIO_CACHE_CONTROL, "ETag": f'"{stem}"'}
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,117 @@
+from html.parser import HTMLParser
+
+# Elements whose text is never article content
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "button", "template"}
+# Void elements never get an end tag, so they must not change any nesting depth
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Block elements treated as paragraphs of body text (<p> is tracked separately -
+# it can't nest and its end tag is often left out)
+PARAGRAPH_TAGS = {"h1", "h2", "h3", "blockquote", "li"}
+# Block elements that implicitly close an open <p> (its end tag is optional)
+BLOCK_TAGS = {
+    "address", "article", "aside", "body", "div", "dl", "fieldset", "figure", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "pre", "section", "table", "td", "ul"
+}
+# Below this much <article> text the page's article element is probably a teaser
+MIN_ARTICLE_CHARS = 500
+# Once there is a usable amount of body text, this much more markup without any
+# new paragraph text means the story is over (comments, related rails, footers)
+QUIET_CHARS = 64 * 1024
+
+class ArticleTextExtractor(HTMLParser):
+    """Incremental article text extraction for streamed HTML.
+
+    Feed it chunks as they arrive. Paragraph text inside `<article>` is
+    preferred, then paragraph text anywhere, then any visible text. `done`
+    turns True once enough preferred text is collected, so the caller can
+    stop downloading.
+    """
+
+    def __init__(self, max_chars: int = 5000):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.skip_tag = None
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.paragraph_depth = 0
+        self.in_p = False
+        self.article_parts = []
+        self.paragraph_parts = []
+        self.other_parts = []
+        self.article_chars = 0
+        self.paragraph_chars = 0
+        self.other_chars = 0
+        self.fed_chars = 0
+        self.last_text_at = 0
+        self.done = False
+
+    def feed(self, data: str):
+        super().feed(data)
+        self.fed_chars += len(data)
+        if self.paragraph_chars >= MIN_ARTICLE_CHARS and self.fed_chars - self.last_text_at > QUIET_CHARS:
+            self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.in_p = False
+        if tag in VOID_TAGS:
+            return
+        if self.skip_tag:
+            # Only the skipped tag's own nesting matters - unclosed children can't leak
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+        elif tag in SKIP_TAGS:
+            self.skip_tag = tag
+            self.skip_depth = 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag == "p":
+            self.in_p = True
+        elif tag in PARAGRAPH_TAGS:
+            self.paragraph_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.in_p = False
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if not self.skip_depth:
+                    self.skip_tag = None
+        elif tag == "article":
+            self.article_depth = max(0, self.article_depth - 1)
+            # The story is over once a substantial <article> closes
+            if self.article_chars >= MIN_ARTICLE_CHARS:
+                self.done = True
+        elif tag == "p":
+            self.in_p = False
+        elif tag in PARAGRAPH_TAGS:
+            self.paragraph_depth = max(0, self.paragraph_depth - 1)
+
+    def handle_data(self, data):
+        if self.skip_tag or self.done:
+            return
+        text = " ".join(data.split())
+        if not text:
+            return
+        if self.in_p or self.paragraph_depth:
+            if self.article_depth:
+                self.article_parts.append(text)
+                self.article_chars += len(text) + 1
+            self.paragraph_parts.append(text)
+            self.paragraph_chars += len(text) + 1
+            self.last_text_at = self.fed_chars
+            # Paragraphs outside <article> only count once the page clearly has none
+            if self.article_chars >= self.max_chars or (not self.article_parts and self.paragraph_chars >= self.max_chars):
+                self.done = True
+        elif self.other_chars < self.max_chars:
+            self.other_parts.append(text)
+            self.other_chars += len(text) + 1
+
+    def text(self) -> str:
+        """Best text collected so far, at most `max_chars` characters"""
+        if self.article_chars >= min(MIN_ARTICLE_CHARS, self.paragraph_chars):
+            parts = self.article_parts
+        else:
+            parts = self.paragraph_parts
+        return " ".join(parts or self.other_parts)[:self.max_chars]
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database import get_database
+
+class LeaderLease:
+    """Lease-based leader election on a Mongo document.
+
+    Every process heartbeats the same lease document. Whoever holds an
+    unexpired lease is the leader; when it stops renewing (crash, shutdown)
+    the lease expires and the next heartbeat from another process takes over.
+    `acquired_hooks` run whenever a running process wins the lease, to catch
+    up on state the previous leader changed.
+    """
+
+    def __init__(self, name: str = "scheduler"):
+        self.name = name
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = settings.leader_lease_seconds
+        self.lease_until = None
+        self.heartbeats = 0
+        # Async callables run when this process becomes leader after its first heartbeat
+        self.acquired_hooks = []
+
+    @property
+    def is_leader(self) -> bool:
+        # Trust the local copy only until it expires, so a process that lost
+        # contact with Mongo stops acting as leader on its own
+        return self.lease_until is not None and datetime.utcnow() < self.lease_until
+
+    async def heartbeat(self) -> bool:
+        """Acquire or renew the lease. Returns True while this process is the leader"""
+        collection = get_database()["scheduler_leases"]
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        was_leader = self.is_leader
+
+        try:
+            await collection.update_one(
+                {
+                    "_id": self.name,
+                    "$or": [{"holder": self.instance_id}, {"expiresAt": {"$lt": now}}]
+                },
+                {"$set": {"holder": self.instance_id, "expiresAt": expires_at, "renewedAt": now}},
+                upsert=True
+            )
+            # No error means we matched our own/an expired lease, or inserted a new one
+            self.lease_until = expires_at
+        except DuplicateKeyError:
+            # Someone else holds a live lease
+            self.lease_until = None
+        except Exception as e:
+            print(f"⚠️ Leader heartbeat failed: {e}")
+
+        if self.is_leader != was_leader:
+            print(f"👑 {'Became' if self.is_leader else 'Lost'} scheduler leader ({self.instance_id})")
+            # A process winning its very first heartbeat is booting - warm-up loads everything then
+            if self.is_leader and self.heartbeats:
+                for hook in self.acquired_hooks:
+                    try:
+                        await hook()
+                    except Exception as e:
+                        print(f"⚠️ Leader hook {getattr(hook, '__name__', hook)} failed: {e}")
+        self.heartbeats += 1
+        return self.is_leader
+
+    async def release(self):
+        """Give up the lease so another process can take over immediately"""
+        if not self.is_leader:
+            return
+        try:
+            await get_database()["scheduler_leases"].delete_one({"_id": self.name, "holder": self.instance_id})
+        except Exception as e:
+            print(f"⚠️ Lease release failed: {e}")
+        self.lease_until = None
+
+    def status(self) -> dict:
+        return {
+            "instance": self.instance_id,
+            "leader": self.is_leader,
+            "leaseUntil": self.lease_until,
+        }
+
+async def renew_lease(collection, query: dict, field: str, seconds: int):
+    """Keep pushing `field` on the matched lease doc `seconds` ahead until cancelled.
+
+    Run as a task next to long work so the lease can't lapse mid-way and let
+    another worker start the same work.
+    """
+    while True:
+        await asyncio.sleep(seconds / 3)
+        try:
+            await collection.update_one(query, {"$set": {field: datetime.utcnow() + timedelta(seconds=seconds)}})
+        except Exception as e:
+            print(f"⚠️ Lease renewal failed: {e}")
+
+leader_lease = LeaderLease()
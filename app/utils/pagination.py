@@ -0,0 +1,37 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+
+# Feed sort order - _id makes it total so a cursor never skips or repeats items
+FEED_SORT = [("publishedAt", -1), ("createdAt", -1), ("_id", -1)]
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just past `doc` in FEED_SORT order"""
+    payload = {
+        "p": doc["publishedAt"].isoformat() if doc.get("publishedAt") else None,
+        "c": doc["createdAt"].isoformat() if doc.get("createdAt") else None,
+        "i": str(doc["_id"]),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """(publishedAt, createdAt, _id) from a cursor. Raises ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        published_at = datetime.fromisoformat(payload["p"]) if payload.get("p") else None
+        created_at = datetime.fromisoformat(payload["c"]) if payload.get("c") else None
+        return published_at, created_at, ObjectId(payload["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+def after_cursor(cursor: str) -> dict:
+    """Range predicate selecting documents after the cursor in FEED_SORT order"""
+    published_at, created_at, object_id = decode_cursor(cursor)
+    return {"$or": [
+        {"publishedAt": {"$lt": published_at}},
+        {"publishedAt": published_at, "createdAt": {"$lt": created_at}},
+        {"publishedAt": published_at, "createdAt": created_at, "_id": {"$lt": object_id}},
+    ]}
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    `acquire()` waits until a token is available, so callers are paced to
+    the provider's quota instead of sleeping a fixed amount between calls.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available and consume them"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -1,21 +1,73 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from datetime import datetime
+from functools import wraps
+from app.config import settings
 from app.services.news_fetcher import news_fetcher
+from app.services.feed_schedule import feed_schedule
+from app.services.trending import trending_service
+from app.services.summary_jobs import summary_jobs
+from app.services.audio_gc import collect_orphaned_audio
+from app.utils.leader import leader_lease
 
 scheduler = AsyncIOScheduler()
 
+def leader_only(job):
+    """Run a job only in the process holding the scheduler lease"""
+    @wraps(job)
+    async def wrapper():
+        if not leader_lease.is_leader:
+            print(f"⏭️ Skipping {job.__name__} - not the scheduler leader")
+            return
+        await job()
+    return wrapper
+
+@leader_only
 async def scheduled_news_fetch():
-    """Scheduled task to fetch news"""
-    print("Running scheduled news fetch...")
-    await news_fetcher.fetch_and_store_all_categories()
+    """Scheduled task to fetch the feeds whose adaptive interval has elapsed"""
+    due = await feed_schedule.due_feeds(news_fetcher.all_feeds())
+    if not due:
+        return
+    print(f"Running scheduled news fetch for {len(due)} feeds...")
+    await news_fetcher.fetch_and_store_all_categories(due)
+
+@leader_only
+async def scheduled_cleanup():
+    """Scheduled task to delete old articles"""
     await news_fetcher.cleanup_old_articles()
 
+async def scheduled_audio_gc():
+    """Scheduled task to delete unreferenced audio - static/audio is each host's own disk"""
+    await collect_orphaned_audio()
+
 def start_scheduler():
     """Start the background scheduler"""
-    # Fetch news every 6 hours
-    scheduler.add_job(scheduled_news_fetch, 'interval', hours=6, id='fetch_news')
+    # Every process heartbeats the lease; only the leader runs the jobs below
+    scheduler.add_job(
+        leader_lease.heartbeat, 'interval', seconds=settings.leader_heartbeat_seconds,
+        id='leader_heartbeat', next_run_time=datetime.now()
+    )
+    
+    # A follower taking over has to pick up what the old leader ingested
+    leader_lease.acquired_hooks.append(news_fetcher.reload_leader_state)
+    leader_lease.acquired_hooks.append(feed_schedule.reload)
+    
+    # Check for due feeds every few minutes - each feed has its own adaptive interval
+    news_fetcher.post_ingest_hooks.append(feed_schedule.record)
+    # Queue summaries for the newest articles so most reads find one ready
+    news_fetcher.post_ingest_hooks.append(summary_jobs.presummarize)
+    scheduler.add_job(scheduled_news_fetch, 'interval', minutes=settings.adaptive_tick_minutes, id='fetch_news')
+    
+    # View counters live per process, so every process flushes and re-ranks its own
+    scheduler.add_job(trending_service.flush, 'interval', seconds=settings.trending_flush_seconds, id='flush_views')
+    scheduler.add_job(
+        trending_service.recompute, 'interval', seconds=settings.trending_recompute_seconds,
+        id='recompute_trending'
+    )
     
     # Cleanup old articles daily
-    scheduler.add_job(news_fetcher.cleanup_old_articles, 'interval', days=1, id='cleanup_articles')
+    scheduler.add_job(scheduled_cleanup, 'interval', days=1, id='cleanup_articles')
+    # Every process sweeps its local audio files, leader or not
+    scheduler.add_job(scheduled_audio_gc, 'interval', days=1, id='collect_audio')
     
     scheduler.start()
     print("Scheduler started")
@@ -23,4 +75,15 @@ def start_scheduler():
 def stop_scheduler():
     """Stop the scheduler"""
     scheduler.shutdown()
-    print("Scheduler stopped")
\ No newline at end of file
+    print("Scheduler stopped")
+
+def scheduler_status() -> dict:
+    """Scheduler state for the readiness endpoint"""
+    return {
+        "running": scheduler.running,
+        "leader": leader_lease.status(),
+        "jobs": [
+            {"id": job.id, "nextRunTime": job.next_run_time.isoformat() if job.next_run_time else None}
+            for job in scheduler.get_jobs()
+        ]
+    }
@@ -0,0 +1,21 @@
+import re
+from typing import List
+
+# `\w` alone splits Devanagari words at every vowel sign (matra), so the
+# Devanagari block is matched explicitly - minus the danda and double danda
+# (U+0964/0965), which are sentence punctuation and split words like "." does.
+TOKEN_RE = re.compile(r'[\w\u0900-\u0963\u0966-\u097F]+')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens for English and Hindi text"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+def text_search_terms(query: str) -> str:
+    """User input as a literal Mongo $text search string.
+
+    Only word tokens survive, so quotes and "-" can't turn into phrase or
+    negation operators. Terms are OR-ed and ranked by textScore.
+    """
+    return " ".join(tokenize(query)[:20])
@@ -0,0 +1,104 @@
+"""Compare streaming article extraction with the old download-then-regex approach.
+
+Serves the saved pages in bench_fixtures/ (as saved, and padded to multi-MB
+the way pages with big hydration scripts and endless "related" rails are)
+through an in-memory transport in 16 KB chunks, then reports time, bytes
+read and whether page chrome leaked into the text.
+Run from the repo root: python bench_extraction.py
+"""
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("NEWS_API_KEY", "bench")
+os.environ.setdefault("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
+
+import httpx
+from app.services.ai_summarizer import ai_summarizer
+from app.services.http_client import http_clients
+
+FIXTURES = Path(__file__).parent / "bench_fixtures"
+CHUNK = 16 * 1024
+RUNS = 20
+# Navigation/footer text that should not end up in a summary
+CHROME = ["Terms", "Privacy", "Sign in", "Sign up", "Most read", "होम", "Advertisement"]
+
+def pad(html: str) -> str:
+    """Multi-MB variant: a large hydration blob up front, long related rails after the story"""
+    blob = '{"id": 12345, "title": "Related story headline", "tags": ["a", "b", "c"]}, ' * 6000
+    rail = '<li><a href="/story">Another related story you might like to read next</a></li>\n' * 20000
+    html = html.replace("</head>", f"<script>window.__DATA__ = [{blob}];</script>\n</head>", 1)
+    return html.replace("</body>", f"<aside><ul>{rail}</ul></aside>\n</body>", 1)
+
+class CountingStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes, counter: dict):
+        self.body = body
+        self.counter = counter
+
+    async def __aiter__(self):
+        for start in range(0, len(self.body), CHUNK):
+            chunk = self.body[start:start + CHUNK]
+            self.counter["bytes"] += len(chunk)
+            yield chunk
+
+def make_client(body: bytes, counter: dict) -> httpx.AsyncClient:
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, stream=CountingStream(body, counter))
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+async def legacy_fetch(client: httpx.AsyncClient, url: str) -> str:
+    # fetch_article_content before streaming extraction
+    response = await client.get(url)
+    html = response.text
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<nav[^>]*>.*?</nav>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', ' ', html)
+    text = ' '.join(text.split())
+    return text[:5000]
+
+async def streaming_fetch(client: httpx.AsyncClient, url: str) -> str:
+    http_clients.clients["publisher"] = client
+    return await ai_summarizer.fetch_article_content(url)
+
+async def measure(fetch, body: bytes):
+    counter = {"bytes": 0}
+    best = float("inf")
+    text = ""
+    async with make_client(body, counter) as client:
+        for _ in range(RUNS):
+            counter["bytes"] = 0
+            started = time.perf_counter()
+            text = await fetch(client, "https://example.com/story")
+            best = min(best, time.perf_counter() - started)
+    leaked = [word for word in CHROME if word in text]
+    return best * 1000, counter["bytes"], text, leaked
+
+async def main():
+    # Keep the per-call log lines out of the report
+    import builtins
+    print_ = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        rows = []
+        for path in sorted(FIXTURES.glob("*.html")):
+            html = path.read_text(encoding="utf-8")
+            for variant, page in [("saved", html), ("padded", pad(html))]:
+                body = page.encode("utf-8")
+                old = await measure(legacy_fetch, body)
+                new = await measure(streaming_fetch, body)
+                rows.append((path.stem, variant, len(body), old, new))
+    finally:
+        builtins.print = print_
+
+    for name, variant, size, old, new in rows:
+        print(f"{name} ({variant}, {size / 1024:.0f} KB)")
+        print(f"  regex     {old[0]:8.2f} ms  read {old[1] / 1024:7.0f} KB  {len(old[2]):5d} chars  chrome: {', '.join(old[3]) or '-'}")
+        print(f"  streaming {new[0]:8.2f} ms  read {new[1] / 1024:7.0f} KB  {len(new[2]):5d} chars  chrome: {', '.join(new[3]) or '-'}")
+        print(f"  -> {old[0] / new[0]:.1f}x speed-up, {old[1] / max(new[1], 1):.1f}x fewer bytes read")
+
+if __name__ == "__main__":
+    asyncio.run(main())
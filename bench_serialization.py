@@ -0,0 +1,74 @@
+"""Compare the orjson article serialisation path with the old Pydantic one.
+
+Checks that both produce identical bytes for 100-article pages, then times them.
+Run from the repo root: python bench_serialization.py
+"""
+import os
+import random
+import timeit
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("NEWS_API_KEY", "bench")
+os.environ.setdefault("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.models.news import NewsResponse
+from app.routes.news import serialize_news, as_news_response
+from app.services.response_cache import render_json
+
+def make_doc(i: int) -> dict:
+    now = datetime(2025, 1, 1, 12, 0, 0) - timedelta(minutes=i, microseconds=random.randint(0, 999) * 1000)
+    doc = {
+        "_id": ObjectId(),
+        "title": f"Headline number {i} with some 'quotes' and ünïcode",
+        "description": "Short description of the story. " * 3,
+        "content": "Body text of the article that is a bit longer. " * 20,
+        "url": f"https://example.com/story/{i}",
+        "urlToImage": f"https://example.com/img/{i}.jpg" if i % 3 else None,
+        "publishedAt": now,
+        "source": {"id": None, "name": "Example News"},
+        "language": "hi" if i % 2 else "en",
+        "category": "technology",
+        "aiSummary": "समाचार का सारांश " * 10 if i % 4 == 0 else None,
+        "audioSummaryUrl": f"/static/audio/{i}.mp3" if i % 4 == 0 else None,
+        "createdAt": now + timedelta(seconds=5),
+    }
+    if i % 10 == 0:
+        # Documents written before source ids were stored
+        doc["source"] = {"name": "Legacy Source"}
+    return doc
+
+docs = [make_doc(i) for i in range(100)]
+model_list = TypeAdapter(List[NewsResponse])
+
+def old_trending() -> bytes:
+    # response_model=List[NewsResponse]: validate, dump in JSON mode, render
+    articles = [serialize_news(doc) for doc in docs]
+    return JSONResponse(content=model_list.dump_python(model_list.validate_python(articles), mode="json")).body
+
+def new_trending() -> bytes:
+    return render_json([as_news_response(serialize_news(doc)) for doc in docs])
+
+def old_feed() -> bytes:
+    payload = {"articles": [serialize_news(doc) for doc in docs], "total": 1000, "page": 1, "limit": 100}
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+def new_feed() -> bytes:
+    payload = {"articles": [serialize_news(doc) for doc in docs], "total": 1000, "page": 1, "limit": 100}
+    return render_json(payload)
+
+if __name__ == "__main__":
+    assert old_trending() == new_trending(), "trending/article payloads differ"
+    assert old_feed() == new_feed(), "feed payloads differ"
+    print("✅ Output identical for 100-article pages")
+
+    for name, old, new in [("trending/article", old_trending, new_trending), ("feed", old_feed, new_feed)]:
+        runs = 200
+        old_time = min(timeit.repeat(old, number=runs, repeat=3)) / runs * 1000
+        new_time = min(timeit.repeat(new, number=runs, repeat=3)) / runs * 1000
+        print(f"{name:>16}: pydantic {old_time:.3f} ms | orjson {new_time:.3f} ms | {old_time / new_time:.1f}x faster")
@@ -0,0 +1,6 @@
+import os
+
+# app.config.Settings needs these at import - the tests never connect anywhere
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("NEWS_API_KEY", "test")
+os.environ.setdefault("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
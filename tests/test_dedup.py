@@ -0,0 +1,68 @@
+from app.services.dedup import BAND_BITS, FINGERPRINT_BITS, NearDuplicateIndex, simhash
+
+STORY = "Big storm hits the coast tonight with heavy rain. Officials warn residents near the coast to stay indoors"
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def flip(fingerprint: int, bits) -> int:
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+def test_simhash_ignores_case_and_punctuation():
+    assert simhash(STORY) == simhash(STORY.upper().replace(".", "!"))
+    assert simhash("भारत में बारिश।") == simhash("भारत में बारिश")
+
+def test_simhash_is_64_bit_and_empty_text_is_zero():
+    assert 0 < simhash(STORY) < 1 << FINGERPRINT_BITS
+    assert simhash("") == 0
+
+def test_simhash_separates_unrelated_stories():
+    other = simhash("Chipmaker raises annual forecast as data centre demand surges for a third quarter")
+    assert distance(simhash(STORY), other) > 3
+
+def test_nearest_finds_fingerprints_within_max_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    base = 0x0123456789ABCDEF
+    index._add("a", base, "cluster-a", None)
+    # One flipped bit in each of three bands - only the fourth band still agrees
+    near = flip(base, [0, BAND_BITS, 2 * BAND_BITS])
+    assert distance(base, near) == 3
+    assert index._nearest(near) == "cluster-a"
+
+def test_nearest_ignores_fingerprints_beyond_max_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    base = 0x0123456789ABCDEF
+    index._add("a", base, "cluster-a", None)
+    # Four bits inside one band - the other bands match, but the distance is too large
+    assert index._nearest(flip(base, [0, 1, 2, 3])) is None
+    # One bit per band - no band in common at all
+    assert index._nearest(flip(base, [0, BAND_BITS, 2 * BAND_BITS, 3 * BAND_BITS])) is None
+
+def test_nearest_prefers_the_closest_match():
+    index = NearDuplicateIndex(max_distance=3)
+    base = 0x0123456789ABCDEF
+    index._add("far", flip(base, [1, 2]), "cluster-far", None)
+    index._add("close", flip(base, [1]), "cluster-close", None)
+    assert index._nearest(base) == "cluster-close"
+
+def test_check_flags_near_duplicates_and_keeps_verdicts():
+    index = NearDuplicateIndex(max_distance=3)
+    original = index.check("https://a.example/story", "Big storm hits the coast", STORY)
+    copy = index.check("https://b.example/story", "Big storm hits the coast!", STORY)
+
+    assert not original["duplicate"] and original["indexed"]
+    assert copy["duplicate"] and copy["clusterId"] == original["clusterId"]
+    # Seen again from another feed - same verdict, not matched against itself
+    again = index.check("https://b.example/story", "Big storm hits the coast!", STORY)
+    assert again["duplicate"] and not again["indexed"]
+
+def test_forget_removes_entry_from_every_band():
+    index = NearDuplicateIndex(max_distance=3)
+    index.check("https://a.example/story", "Big storm hits the coast", STORY)
+    index.forget("https://a.example/story")
+
+    assert not index.entries
+    assert all(not band for band in index.bands)
+    assert not index.check("https://b.example/story", "Big storm hits the coast", STORY)["duplicate"]
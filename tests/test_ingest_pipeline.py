@@ -0,0 +1,67 @@
+import asyncio
+from app.services.ingest_pipeline import IngestPipeline, Stage
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_items_drain_through_every_stage():
+    async def double(item):
+        await asyncio.sleep(0)
+        return item * 2
+
+    async def add_one(item):
+        return item + 1
+
+    pipeline = IngestPipeline([Stage("double", double, workers=3, queue_size=2), Stage("add", add_one, workers=2, queue_size=2)])
+    results = run(pipeline.run(list(range(20))))
+
+    assert sorted(results) == [n * 2 + 1 for n in range(20)]
+    stats = pipeline.stats()
+    assert stats["double"]["processed"] == stats["add"]["processed"] == 20
+    assert all(stage.queue.empty() for stage in pipeline.stages)
+
+def test_failing_item_is_isolated():
+    async def parse(item):
+        if item == 3:
+            raise ValueError("bad batch")
+        return item
+
+    async def store(item):
+        return item
+
+    pipeline = IngestPipeline([Stage("parse", parse), Stage("store", store)])
+    results = run(pipeline.run([1, 2, 3, 4]))
+
+    assert sorted(results) == [1, 2, 4]
+    assert pipeline.stats()["parse"]["errors"] == 1
+    assert pipeline.stats()["store"]["processed"] == 3
+
+def test_none_ends_an_items_trip():
+    async def keep_even(item):
+        return item if item % 2 == 0 else None
+
+    async def store(item):
+        return item
+
+    pipeline = IngestPipeline([Stage("filter", keep_even), Stage("store", store)])
+    assert sorted(run(pipeline.run(list(range(6))))) == [0, 2, 4]
+
+def test_queues_stay_bounded():
+    async def fast(item):
+        return item
+
+    async def slow(item):
+        await asyncio.sleep(0.001)
+        return item
+
+    pipeline = IngestPipeline([Stage("fetch", fast, workers=4, queue_size=2), Stage("store", slow, queue_size=2)])
+    run(pipeline.run(list(range(30))))
+
+    for stage in pipeline.stages:
+        assert stage.max_depth <= stage.queue.maxsize
+
+def test_empty_input():
+    async def handler(item):
+        return item
+
+    assert run(IngestPipeline([Stage("only", handler)]).run([])) == []
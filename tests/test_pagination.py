@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.utils.pagination import FEED_SORT, after_cursor, decode_cursor, encode_cursor
+
+mongomock = pytest.importorskip("mongomock")
+
+@pytest.fixture
+def news():
+    collection = mongomock.MongoClient().db.news
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    docs = []
+    for n in range(25):
+        # Plenty of ties on publishedAt and createdAt, so _id has to break them
+        docs.append({
+            "_id": ObjectId(),
+            "publishedAt": base - timedelta(hours=n // 4),
+            "createdAt": base + timedelta(minutes=n % 2),
+        })
+    collection.insert_many(docs)
+    return collection
+
+def ids(cursor):
+    return [doc["_id"] for doc in cursor]
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "publishedAt": datetime(2026, 1, 1, 8, 30), "createdAt": datetime(2026, 1, 1, 9, 0, 5)}
+    assert decode_cursor(encode_cursor(doc)) == (doc["publishedAt"], doc["createdAt"], doc["_id"])
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor({"_id": ObjectId(), "publishedAt": datetime(2026, 1, 1), "createdAt": datetime(2026, 1, 1)})
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+def test_malformed_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_cursor_page_matches_skip_page(news):
+    first = list(news.find().sort(FEED_SORT).limit(10))
+    after = ids(news.find(after_cursor(encode_cursor(first[-1]))).sort(FEED_SORT).limit(10))
+    assert after == ids(news.find().sort(FEED_SORT).skip(10).limit(10))
+
+def test_walking_cursors_visits_every_doc_once(news):
+    seen = []
+    query = {}
+    while True:
+        page = list(news.find(query).sort(FEED_SORT).limit(7))
+        seen.extend(doc["_id"] for doc in page)
+        if len(page) < 7:
+            break
+        query = after_cursor(encode_cursor(page[-1]))
+    assert seen == ids(news.find().sort(FEED_SORT))